@@ -1,14 +1,22 @@
 import sys
 import os
+import bisect
 import random
+import selectors
 import tempfile
 import platform
 import shutil
 import time
 import uuid
 import json
+import hashlib
+import itertools
 import math
 import subprocess
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -33,14 +41,13 @@ from PyQt5.QtWidgets import (
     QStyle,
     QFrame,
     QTabWidget,
-    QInputDialog,
     QTableWidget,
     QTableWidgetItem,
     QHeaderView,
     QDoubleSpinBox,
     QComboBox,
 )
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, QMediaPlaylist
+from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
 from PyQt5.QtMultimediaWidgets import QVideoWidget
 from PyQt5.QtCore import (
     Qt,
@@ -49,80 +56,368 @@ from PyQt5.QtCore import (
     pyqtSignal,
     QSize,
     QObject,
-    QMetaObject,
-    Q_ARG,
     QRect,
+    QLine,
     QTimer,
+    QRunnable,
+    QThreadPool,
+    QEvent,
+)
+from PyQt5.QtGui import (
+    QIcon,
+    QFont,
+    QColor,
+    QPainter,
+    QPen,
+    QPixmap,
+    QTransform,
+    QImageReader,
 )
-from PyQt5.QtGui import QIcon, QFont, QPalette, QColor, QPainter, QPen
 
 # Create dedicated temp directory
 TEMP_DIR = os.path.join(tempfile.gettempdir(), "video_editor_temp")
 os.makedirs(TEMP_DIR, exist_ok=True)
 
+# Temp file names: process id and start time keep sessions apart, the counter
+# keeps files within a session apart without reading the system RNG each time
+_temp_name_prefix = f"{os.getpid()}_{int(time.time())}"
+_temp_name_counter = itertools.count()
+
+
+def unique_name(prefix, ext=""):
+    """Make a temp file name unique to this session, e.g. files_1234_1700000000_7.txt"""
+    return f"{prefix}_{_temp_name_prefix}_{next(_temp_name_counter)}{ext}"
+
+
 # Create preview directory
 PREVIEW_DIR = os.path.join(TEMP_DIR, "previews")
 os.makedirs(PREVIEW_DIR, exist_ok=True)
 
+# Fragmented MP4 lets the player open a preview while it is still being written
+PREVIEW_MOVFLAGS = ["-movflags", "+frag_keyframe+empty_moov+default_base_moof"]
+PREVIEW_START_BYTES = 256 * 1024  # Written bytes before playback can start
+
+PREVIEW_CACHE_BYTES = 2 * 1024**3  # Item previews kept on disk before the oldest go
+
+# Create directory for Preview All segments kept between runs
+SEGMENT_DIR = os.path.join(TEMP_DIR, "segments")
+os.makedirs(SEGMENT_DIR, exist_ok=True)
+SEGMENT_CACHE_SIZE = 64  # Encoded segments kept on disk
+SEGMENT_BATCH_SIZE = 8  # Segments encoded by one ffmpeg process in Preview All
+_segment_cache = OrderedDict()  # Segment path -> None, least recently used first
+
 
 def clean_directory(directory):
     """Clean a directory with error handling"""
     try:
-        for item in os.listdir(directory):
-            path = os.path.join(directory, item)
-            try:
-                if os.path.isfile(path) or os.path.islink(path):
-                    os.unlink(path)
-                elif os.path.isdir(path):
-                    shutil.rmtree(path)
-            except Exception as e:
-                print(f"Warning: Failed to delete {path}: {e}")
+        # DirEntry caches the file type, saving a stat per check
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.unlink(entry.path)
+                except Exception as e:
+                    print(f"Warning: Failed to delete {entry.path}: {e}")
     except Exception as e:
         print(f"Warning: Error cleaning directory {directory}: {e}")
 
 
-def check_hw_encoders():
-    """Check for available hardware encoders"""
-    encoders = []
-
-    # Check for NVIDIA encoder
+def get_cpu_count():
+    """Get the number of CPUs this process may run on"""
     try:
-        nvidia = subprocess.run(
-            ["ffmpeg", "-hide_banner", "-encoders"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        if "h264_nvenc" in nvidia.stdout:
-            encoders.append("h264_nvenc")
-    except:
-        pass
+        # Respects taskset and container CPU limits
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+CPU_COUNT = get_cpu_count()
+
+
+_hw_encoders = None  # Cached result of check_hw_encoders
+_hw_decoders = None  # Cached result of check_hw_decoders
+
+
+def detect_hw_support():
+    """Query ffmpeg's encoders and hwaccels once, running both queries at the same time"""
+    global _hw_encoders, _hw_decoders
+    encoders = []
+    decoders = []
 
-    # Check for VA-API (Intel/AMD on Linux)
     try:
-        if os.path.exists("/dev/dri"):
+        queries = [
+            subprocess.Popen(
+                ["ffmpeg", "-hide_banner", option],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            for option in ("-encoders", "-hwaccels")
+        ]
+        encoder_list, _ = queries[0].communicate(timeout=5)
+        hwaccel_list, _ = queries[1].communicate(timeout=5)
+
+        # NVIDIA, QuickSync (Intel), AMF (AMD) and VideoToolbox (macOS)
+        for encoder in ("h264_nvenc", "h264_qsv", "h264_amf", "h264_videotoolbox"):
+            if encoder.encode() in encoder_list:
+                encoders.append(encoder)
+        # VA-API (Intel/AMD on Linux)
+        if b"h264_vaapi" in encoder_list and os.path.exists("/dev/dri"):
             encoders.append("h264_vaapi")
-    except:
-        pass
 
-    # Check for QuickSync (Intel)
-    try:
-        qsv = subprocess.run(
-            ["ffmpeg", "-hide_banner", "-encoders"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        if "h264_qsv" in qsv.stdout:
-            encoders.append("h264_qsv")
-    except:
-        pass
+        # The first line is the "Hardware acceleration methods:" header
+        decoders = [
+            line.strip().decode() for line in hwaccel_list.splitlines()[1:] if line.strip()
+        ]
+    except Exception as e:
+        print(f"Warning: Failed to query ffmpeg hardware support: {e}")
 
     # If no HW encoders found, use libx264 (CPU)
     if not encoders:
         encoders.append("libx264")
 
-    return encoders
+    _hw_encoders = encoders
+    _hw_decoders = decoders
+
+
+def check_hw_encoders():
+    """Check for available hardware encoders"""
+    if _hw_encoders is None:
+        detect_hw_support()
+    return list(_hw_encoders)
+
+
+def check_hw_decoders():
+    """Check for available hardware decoding methods (ffmpeg -hwaccels)"""
+    if _hw_decoders is None:
+        detect_hw_support()
+    return list(_hw_decoders)
+
+
+# Probe limits for intermediate MP4 files we wrote ourselves
+FAST_PROBE_ARGS = ["-probesize", "32k", "-analyzeduration", "0"]
+
+# Containers whose header already describes every stream
+HEADER_PROBED_EXTENSIONS = {".mp4", ".m4v", ".mov"}
+
+
+def source_probe_args(file_path):
+    """Get probe limits for a source that needs no stream analysis before decoding"""
+    if os.path.splitext(file_path)[1].lower() in HEADER_PROBED_EXTENSIONS:
+        return FAST_PROBE_ARGS
+    return []
+
+
+# Filter chains longer than this are passed in a script file instead of on the
+# command line, which keeps them clear of the OS argument length limit
+FILTER_SCRIPT_THRESHOLD = 8000
+
+
+def video_filter_args(vf, script_dir, scripts=None):
+    """Get the ffmpeg args for a video filter chain, writing long chains to a script"""
+    if len(vf) <= FILTER_SCRIPT_THRESHOLD:
+        return ["-vf", vf]
+    path = os.path.join(script_dir, unique_name("filter", ".txt"))
+    with open(path, "w") as f:
+        f.write(vf)
+    if scripts is not None:
+        scripts.append(path)
+    return ["-filter_script:v", path]
+
+
+def remove_filter_scripts(scripts):
+    """Delete filter script files once the ffmpeg run that used them is over"""
+    for path in scripts:
+        try:
+            os.unlink(path)
+        except OSError as e:
+            print(f"Warning: Failed to remove filter script {path}: {e}")
+    scripts.clear()
+
+
+# Input args that read a concat demuxer list from stdin, see concat_list
+CONCAT_STDIN_ARGS = ["-f", "concat", "-safe", "0", "-protocol_whitelist", "file,pipe", "-i", "pipe:0"]
+
+
+def concat_list(files, probe_args=()):
+    """Build a concat demuxer file list to feed ffmpeg on stdin
+
+    probe_args such as FAST_PROBE_ARGS are set on every listed file; on the
+    command line they would only apply to reading the list itself.
+    """
+    options = "".join(
+        f"option {name.lstrip('-')} {value}\n"
+        for name, value in zip(probe_args[::2], probe_args[1::2])
+    )
+    lines = ["ffconcat version 1.0\n"]
+    for file_path in files:
+        fixed_path = os.path.abspath(file_path).replace("\\", "/").replace("'", "'\\''")
+        # Without a protocol the entries would be resolved against the pipe
+        lines.append(f"file 'file:{fixed_path}'\n{options}")
+    return "".join(lines).encode()
+
+
+EXPORT_SINGLE_PASS_ITEMS = 16  # Re-encoded exports up to this size run as one filter graph
+EXPORT_HEIGHT = 720
+
+# Muxer options for exported files: index at the front so they start playing while
+# downloading, and packets batched into large writes instead of flushed one by one
+EXPORT_MUX_ARGS = ["-movflags", "+faststart", "-flush_packets", "0"]
+
+# Encoder options for quick previews and final exports
+VIDEO_ENCODER_ARGS = {
+    "libx264": {
+        # Lookahead, B-frames and extra references buy nothing for a throwaway preview
+        "preview": [
+            "-preset", "superfast", "-tune", "fastdecode,zerolatency", "-crf", "28",
+            "-x264-params", "rc-lookahead=10:ref=1:bframes=0:sliced-threads=1",
+        ],
+        "export": ["-preset", "medium", "-crf", "22", "-profile:v", "high", "-level:v", "4.1"],
+    },
+    "h264_nvenc": {
+        "preview": ["-preset", "p1", "-tune", "ll", "-rc", "vbr", "-cq", "28"],
+        "export": [
+            "-preset", "p5", "-rc", "vbr", "-cq", "22", "-b:v", "0",
+            "-profile:v", "high", "-level:v", "4.1",
+        ],
+    },
+    "h264_qsv": {
+        "preview": ["-preset", "veryfast", "-global_quality", "28"],
+        "export": ["-preset", "medium", "-global_quality", "22"],
+    },
+    "h264_amf": {
+        "preview": ["-quality", "speed", "-rc", "cqp", "-qp_i", "28", "-qp_p", "28"],
+        "export": ["-quality", "quality", "-rc", "cqp", "-qp_i", "22", "-qp_p", "22"],
+    },
+    "h264_vaapi": {
+        "preview": ["-qp", "28"],
+        "export": ["-qp", "22"],
+    },
+    "h264_videotoolbox": {
+        # Fall back to Apple's software encoder when the hardware one is busy
+        "preview": ["-realtime", "true", "-allow_sw", "1", "-b:v", "2M"],
+        "export": ["-allow_sw", "1", "-b:v", "8M", "-profile:v", "high"],
+    },
+}
+
+# Bitstream filters that convert MP4-style video packets for MPEG-TS segments
+ANNEXB_BITSTREAM_FILTERS = {
+    "h264": "h264_mp4toannexb",
+    "hevc": "hevc_mp4toannexb",
+}
+
+VAAPI_DEVICE = "/dev/dri/renderD128"
+
+_encoder_status = {}  # Encoder name -> whether a test encode succeeded
+
+
+def encoder_works(encoder):
+    """Check that an encoder can actually open on this machine"""
+    if encoder not in _encoder_status:
+        try:
+            # Builds often list GPU encoders that have no device to run on
+            input_args, upload_filter = hw_upload_args(encoder)
+            result = subprocess.run(
+                [
+                    "ffmpeg", "-v", "error", *input_args,
+                    "-f", "lavfi", "-i", "color=black:s=256x256:d=0.1",
+                    "-frames:v", "1",
+                    *(["-vf", upload_filter.lstrip(",")] if upload_filter else []),
+                    "-c:v", encoder, "-f", "null", "-",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=10,
+            )
+            _encoder_status[encoder] = result.returncode == 0
+        except Exception as e:
+            print(f"Warning: Could not test encoder {encoder}: {e}")
+            _encoder_status[encoder] = False
+    return _encoder_status[encoder]
+
+
+_encoder_probe_lock = threading.Lock()  # One thread runs the encoder probes, others wait
+
+
+def select_video_encoder(use_gpu=True, allow_vaapi=False, wait=True):
+    """Pick the fastest working H.264 encoder
+
+    Without wait, returns None instead of blocking while probes still have to run.
+    """
+    if use_gpu:
+        if not _encoder_probe_lock.acquire(blocking=wait):
+            return None
+        try:
+            if not wait and _hw_encoders is None:
+                return None
+            for encoder in check_hw_encoders():
+                # VA-API needs a hardware upload step the caller has to add to its filter chain
+                if encoder == "h264_vaapi" and not allow_vaapi:
+                    continue
+                if encoder not in VIDEO_ENCODER_ARGS or encoder == "libx264":
+                    continue
+                if not wait and encoder not in _encoder_status:
+                    return None
+                if encoder_works(encoder):
+                    return encoder
+        finally:
+            _encoder_probe_lock.release()
+    return "libx264"
+
+
+def probe_encoders_in_background():
+    """Run the hardware encoder probes at startup so the first preview doesn't wait on them"""
+    threading.Thread(
+        target=select_video_encoder, kwargs={"allow_vaapi": True}, daemon=True
+    ).start()
+
+
+def hw_upload_args(encoder):
+    """Get (input args, filter suffix) that feed frames to an encoder"""
+    if encoder == "h264_vaapi":
+        # Frames are converted and uploaded to the GPU at the end of the filter chain
+        return ["-vaapi_device", VAAPI_DEVICE], ",format=nv12,hwupload"
+    # Converting in the chain lets the scaler output yuv420p directly,
+    # where -pix_fmt would add another conversion after the graph
+    return [], ",format=yuv420p"
+
+
+def hw_decode_args(use_gpu=True):
+    """Get input args that let ffmpeg decode on the GPU when it can"""
+    if use_gpu and check_hw_decoders():
+        # Decoded frames are copied back so the software filters still apply
+        return ["-hwaccel", "auto"]
+    return []
+
+
+def video_encoder_args(encoder, quality="preview", threads=None):
+    """Get the ffmpeg video codec arguments for an encoder
+
+    threads is the encoder's share of the cores when several encode at once.
+    """
+    args = ["-c:v", encoder] + VIDEO_ENCODER_ARGS[encoder][quality]
+    if encoder == "libx264":
+        # x264 sizes its thread pool from all host cores, not the ones we may use
+        args += ["-threads", str(threads or CPU_COUNT)]
+    return args
+
+
+def threads_per_encoder(encoders):
+    """Split the usable cores between encoders that run at the same time"""
+    return max(1, CPU_COUNT // max(1, encoders))
+
+
+GPU_ENCODE_SESSIONS = 2  # Consumer GPUs refuse encode sessions beyond a small cap
+
+
+def encoder_workers(encoder, jobs):
+    """How many ffmpeg processes may run jobs with encoder at the same time"""
+    if encoder == "libx264":
+        limit = CPU_COUNT // 2
+    else:
+        limit = GPU_ENCODE_SESSIONS
+    return max(1, min(jobs, limit))
 
 
 def cleanup_temp_dirs():
@@ -135,10 +430,410 @@ def cleanup_temp_dirs():
         print(f"Warning: Error during cleanup: {e}")
 
 
+STALE_DIR_PREFIX = "video_editor_stale_"
+
+
+def remove_stale_dirs():
+    """Delete temp directories moved aside by earlier sessions"""
+    root = tempfile.gettempdir()
+    try:
+        with os.scandir(root) as it:
+            stale = [e.path for e in it if e.name.startswith(STALE_DIR_PREFIX)]
+    except OSError as e:
+        print(f"Warning: Error listing {root}: {e}")
+        return
+    for path in stale:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def cleanup_temp_dirs_in_background():
+    """Move the last session's temp files aside and delete them without blocking"""
+    stale = os.path.join(tempfile.gettempdir(), f"{STALE_DIR_PREFIX}{uuid.uuid4().hex}")
+    try:
+        os.rename(TEMP_DIR, stale)
+    except OSError as e:
+        # Something still holds a file open, clean in place instead
+        print(f"Warning: Could not move temp directory aside: {e}")
+        cleanup_temp_dirs()
+    for directory in (TEMP_DIR, PREVIEW_DIR, SEGMENT_DIR):
+        os.makedirs(directory, exist_ok=True)
+    threading.Thread(target=remove_stale_dirs, daemon=True).start()
+
+
+def get_cached_segment(path):
+    """Return a cached segment path if it is still on disk"""
+    if path in _segment_cache:
+        if os.path.exists(path):
+            _segment_cache.move_to_end(path)
+            return path
+        del _segment_cache[path]
+    return None
+
+
+def trim_preview_cache(keep=None, limit=PREVIEW_CACHE_BYTES):
+    """Delete the least recently used item previews once they exceed the size limit"""
+    try:
+        entries = []
+        total = 0
+        with os.scandir(PREVIEW_DIR) as it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError as e:
+                print(f"Warning: Failed to evict preview {path}: {e}")
+    except OSError as e:
+        print(f"Warning: Error trimming preview cache: {e}")
+
+
+_preview_file_locks = {}  # Preview path -> lock held while it is rendered
+_preview_file_locks_guard = threading.Lock()
+
+
+def preview_file_lock(path):
+    """Get the lock that serializes renders of one preview file"""
+    with _preview_file_locks_guard:
+        return _preview_file_locks.setdefault(path, threading.Lock())
+
+
+def source_fingerprint(file_path):
+    """Identify a source file by path, size and modification time"""
+    try:
+        stat = os.stat(file_path)
+        key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    except OSError:
+        key = os.path.abspath(file_path)
+    return hashlib.blake2b(key.encode(), digest_size=6).hexdigest()
+
+
+def file_size(path):
+    """Get a file's size with a single stat, or -1 if it does not exist"""
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return -1
+
+
+def stop_process(process, grace=2):
+    """Terminate a child process, killing it if it has not exited within grace seconds"""
+    process.terminate()
+    try:
+        process.wait(timeout=grace)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def remove_file(path):
+    """Delete a file if it is there, without a separate existence check"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Warning: Failed to delete {path}: {e}")
+
+
+def link_or_copy(src, dst):
+    """Give a file a second name, copying only if a hard link is not possible"""
+    # Segments are unlinked before they are ever rendered again, so the
+    # shared data is never rewritten in place
+    try:
+        os.link(src, dst)
+    except OSError:
+        # copyfile uses the kernel's zero-copy paths and skips copying permission bits
+        shutil.copyfile(src, dst)
+
+
+def remove_files(paths):
+    """Delete several files, overlapping the unlinks since each can stall on slow disks"""
+    paths = list(paths)
+    if len(paths) < 4:
+        for path in paths:
+            remove_file(path)
+        return
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+        list(executor.map(remove_file, paths))
+
+
+def discard_partial_preview(path):
+    """Delete a preview that ffmpeg did not finish writing"""
+    remove_file(path)
+
+
+def cache_segment(path):
+    """Remember an encoded segment, dropping the least recently used ones"""
+    _segment_cache[path] = None
+    _segment_cache.move_to_end(path)
+    while len(_segment_cache) > SEGMENT_CACHE_SIZE:
+        old_path, _ = _segment_cache.popitem(last=False)
+        remove_file(old_path)
+
+
+def release_segments(files, keep=None):
+    """Delete temporary segments that are not held by the segment cache"""
+    remove_files(path for path in files if path != keep and path not in _segment_cache)
+
+
+def music_mix_filter(tracks, first_input=1, audio="[0:a]"):
+    """Get (input args, filter graph) that mix music tracks into the audio label as [a]
+
+    Music inputs are numbered from first_input. Returns None when none of the files exist.
+    """
+    input_args = []
+    filters = []
+    labels = []
+    for track in tracks:
+        if not os.path.exists(track.file_path):
+            continue
+        index = len(labels) + first_input
+        input_args.extend(["-i", track.file_path])
+        steps = []
+        if track.volume != 1.0:
+            steps.append(f"volume={track.volume}")
+        if track.start_time_in_track > 0 or track.duration:
+            trim = f"atrim=start={track.start_time_in_track}"
+            if track.duration:
+                trim += f":duration={track.duration}"
+            steps.append(trim)
+        if track.start_time_in_compilation > 0:
+            # Place the track where it starts in the compilation
+            delay = int(track.start_time_in_compilation * 1000)
+            steps.append(f"adelay={delay}|{delay}")
+        if steps:
+            labels.append(f"[m{index}]")
+            filters.append(f"[{index}:a]{','.join(steps)}{labels[-1]}")
+        else:
+            # Untouched tracks feed the mix straight from the input
+            labels.append(f"[{index}:a]")
+    if not labels:
+        return None
+    if len(labels) > 1:
+        filters.append(f"{''.join(labels)}amix=inputs={len(labels)}:duration=longest[music]")
+        music = "[music]"
+    else:
+        music = labels[0]
+    filters.append(f"{audio}{music}amix=inputs=2:duration=first[a]")
+    return input_args, ";".join(filters)
+
+
+def grab_frame(file_path, time_pos, width=160):
+    """Decode a single frame as PNG bytes, seeking on the input for speed"""
+    try:
+        result = subprocess.run(
+            [
+                "ffmpeg", "-v", "error",
+                "-ss", f"{max(0.0, time_pos):.3f}",
+                "-i", file_path,
+                "-frames:v", "1",
+                "-vf", f"scale={width}:-2",
+                "-f", "image2pipe", "-vcodec", "png", "-",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=10,
+        )
+        if result.returncode == 0 and result.stdout:
+            return result.stdout
+    except Exception as e:
+        print(f"Warning: Failed to grab frame from {file_path}: {e}")
+    return None
+
+
+def rotation_filters(degrees):
+    """Get the filters that turn frames clockwise by the given angle"""
+    degrees %= 360
+    # Quarter turns are a plain pixel reshuffle, no need for the interpolating rotate
+    if degrees == 90:
+        return ["transpose=1"]
+    if degrees == 180:
+        # Same pixels as two transposes, and vflip only flips line pointers
+        return ["hflip", "vflip"]
+    if degrees == 270:
+        return ["transpose=2"]
+    if degrees:
+        return [f"rotate={degrees*math.pi/180}"]
+    return []
+
+
+def parse_frame_rate(rate):
+    """Turn an ffprobe rate such as "30000/1001" into frames per second"""
+    try:
+        num, _, den = str(rate).partition("/")
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def preview_filter_chain(degrees, video_effects="", size=None, frame_rate=None):
+    """Build a preview filter chain: effects, frame rate, downscale, then rotation
+
+    When the source size or frame rate is given, steps that would not
+    change anything are left out.
+    """
+    turned = degrees % 360 in (90, 270)
+    chain = []
+    # Drop frames and shrink before rotating so less work is done per frame
+    if not frame_rate or frame_rate > 24:
+        chain.append("fps=24")
+    width, height = size or (0, 0)
+    shown_width = height if turned else width
+    if not (0 < shown_width <= 480 and width % 2 == 0 and height % 2 == 0):
+        # 480 wide once turned; the fastest scaler is plenty for a preview
+        chain.append(
+            "scale=-2:480:flags=fast_bilinear" if turned else "scale=480:-2:flags=fast_bilinear"
+        )
+    chain.extend(rotation_filters(degrees))
+    if video_effects:
+        chain.insert(0, video_effects)
+    return ",".join(chain) or "null"
+
+
+# Repeats a still image's one decoded frame until the output duration is reached
+STILL_IMAGE_LOOP = "loop=loop=-1:size=1:start=0"
+
+
+def loop_still_image(vf, video_effects=""):
+    """Repeat a still image inside its filter chain instead of decoding it for every frame"""
+    if video_effects:
+        # Effects may change from frame to frame, so they run on every repeat
+        return f"{STILL_IMAGE_LOOP},{vf}"
+    # Scale and rotate the single frame once, then repeat the result
+    return f"{vf},{STILL_IMAGE_LOOP}"
+
+
+THUMB_STRIP_COLUMNS = 20  # Frames in the scrub strip shown while trimming
+THUMB_STRIP_CACHE_SIZE = 32  # Strips kept in memory
+_thumb_strips = OrderedDict()  # Source fingerprint -> JPEG strip bytes, least recently used first
+_thumb_strips_lock = threading.Lock()  # Strips are built on the global thread pool
+
+
+def get_thumb_strip(key):
+    """Return a cached scrub strip, or None"""
+    with _thumb_strips_lock:
+        data = _thumb_strips.get(key)
+        if data is not None:
+            _thumb_strips.move_to_end(key)
+        return data
+
+
+def cache_thumb_strip(key, data):
+    """Remember a scrub strip, dropping the least recently used ones"""
+    with _thumb_strips_lock:
+        _thumb_strips[key] = data
+        _thumb_strips.move_to_end(key)
+        while len(_thumb_strips) > THUMB_STRIP_CACHE_SIZE:
+            _thumb_strips.popitem(last=False)
+
+
+def grab_thumb_strip(file_path, duration, columns=THUMB_STRIP_COLUMNS, width=160):
+    """Decode evenly spaced frames into one JPEG strip in a single pass, returning its bytes"""
+    if not duration or duration <= 0:
+        return None
+    try:
+        result = subprocess.run(
+            [
+                "ffmpeg", "-v", "error",
+                "-i", file_path,
+                "-an",
+                "-vf", f"fps={columns / duration:.6f},scale={width}:-2,tile={columns}x1",
+                "-frames:v", "1", "-q:v", "5",
+                "-f", "image2pipe", "-vcodec", "mjpeg", "-",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=60,
+        )
+        if result.returncode == 0 and result.stdout:
+            return result.stdout
+    except Exception as e:
+        print(f"Warning: Failed to build thumbnail strip for {file_path}: {e}")
+    return None
+
+
+# Only the fields the media items read, which keeps the JSON small to parse
+PROBE_ENTRIES = (
+    "format=duration"
+    ":stream=codec_type,codec_name,bits_per_raw_sample,width,height,pix_fmt,"
+    "r_frame_rate,sample_rate,channels"
+    ":stream_tags=rotate"
+    ":stream_side_data=side_data_type,rotation"
+)
+
+
+_probe_cache = {}  # Source fingerprint -> parsed ffprobe output
+
+
+def probe_media(file_path):
+    """Run ffprobe on a media file and return the parsed JSON"""
+    # Re-adding a file, or loading a project that uses it again, skips ffprobe
+    key = source_fingerprint(file_path)
+    if key in _probe_cache:
+        return _probe_cache[key]
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-print_format", "json",
+        "-show_entries", PROBE_ENTRIES,
+        file_path,
+    ]
+    # json.loads takes the raw bytes, no need to decode the whole output first
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise ValueError(f"ffprobe failed: {result.stderr.decode('utf-8', 'replace')}")
+    probe = _probe_cache[key] = json.loads(result.stdout)
+    return probe
+
+
+def can_stream_copy_items(items):
+    """Check if items can be joined with the concat demuxer without re-encoding"""
+    if not items or not all(item.can_stream_copy() for item in items):
+        return False
+    # Concat demuxer needs identical codec, resolution, frame rate and audio layout
+    return len({item.get_stream_signature() for item in items}) == 1
+
+
+def _invalidating_property(name):
+    """Property that drops a MediaItem's memoized filter and filename when set"""
+    attr = "_" + name
+
+    def getter(self):
+        return getattr(self, attr)
+
+    def setter(self, value):
+        setattr(self, attr, value)
+        self._invalidate_caches()
+
+    return property(getter, setter)
+
+
 class MediaItem:
     """Base class for video and image items"""
 
+    # Inputs to the memoized filter string and preview filename
+    display_duration = _invalidating_property("display_duration")
+    start_time = _invalidating_property("start_time")
+    end_time = _invalidating_property("end_time")
+    duration = _invalidating_property("duration")
+    rotation = _invalidating_property("rotation")
+    manual_rotation = _invalidating_property("manual_rotation")
+    playback_speed = _invalidating_property("playback_speed")
+    effects = _invalidating_property("effects")
+
     def __init__(self, file_path, is_image=False):
+        self._filter_cache = None
+        self._vf_cache = {}
+        self._name_cache = None
         self.file_path = file_path
         self.is_image = is_image
         self.display_duration = 5.0  # Default duration for images (seconds)
@@ -153,18 +848,36 @@ class MediaItem:
         self.effects = []  # List of VideoEffect objects applied to this item
         self.playback_speed = 1.0  # Default playback speed
         self.has_pending_changes = False  # Indicator for unsaved changes
+        self.has_audio = False  # Set from the initial probe for videos
+        self.source_key = source_fingerprint(file_path)  # Stable across items and runs
+
+    def _invalidate_caches(self):
+        """Forget the memoized filter strings and preview filename"""
+        self._filter_cache = None
+        self._vf_cache = {}
+        self._name_cache = None
 
     def get_preview_filename(self):
         """Generate a unique filename for preview"""
+        if self._name_cache is None:
+            self._name_cache = self._build_preview_filename()
+        return self._name_cache
+
+    def _build_preview_filename(self):
         name = os.path.basename(self.file_path)
         base, _ = os.path.splitext(name)
         base = base.replace(" ", "_")
 
-        # Include effects in the filename to ensure unique cache
+        # Include effects and their parameters so each setting gets its own file
         effects_hash = ""
         if self.effects:
-            effects_str = "_".join(e.effect_type for e in self.effects)
-            effects_hash = f"_fx{hash(effects_str) % 10000}"
+            effects_str = json.dumps(
+                [[e.effect_type, e.parameters] for e in self.effects],
+                sort_keys=True,
+                default=str,
+            )
+            digest = hashlib.blake2b(effects_str.encode(), digest_size=8).hexdigest()
+            effects_hash = f"_fx{digest}"
 
         # Include speed in filename for cache uniqueness
         speed_str = f"_sp{int(self.playback_speed*100)}"
@@ -172,27 +885,30 @@ class MediaItem:
         if self.is_image:
             return os.path.join(
                 PREVIEW_DIR,
-                f"{base}_{self.item_id}_d{self.display_duration}_r{self.manual_rotation}{effects_hash}.mp4",
+                f"{base}_{self.source_key}_d{self.display_duration}_r{self.manual_rotation}{effects_hash}.mp4",
             )
         else:
             return os.path.join(
                 PREVIEW_DIR,
-                f"{base}_{self.item_id}_s{self.start_time}_e{self.end_time or self.duration}_r{self.manual_rotation}{effects_hash}{speed_str}.mp4",
+                f"{base}_{self.source_key}_s{self.start_time}_e{self.end_time or self.duration}_r{self.manual_rotation}{effects_hash}{speed_str}.mp4",
             )
 
     def invalidate_preview(self):
         """Mark the preview as invalid"""
-        if self.preview_file and os.path.exists(self.preview_file):
-            try:
-                os.unlink(self.preview_file)
-            except Exception as e:
-                print(f"Warning: Error deleting preview file: {e}")
+        # Previews are named by their settings, so the old file stays for reuse
+        # if the item is switched back; trim_preview_cache bounds the directory
         self.preview_file = None
         self.preview_status = "none"
         self.has_pending_changes = True
+        self._invalidate_caches()
 
     def get_effects_filter_string(self):
         """Get the combined filter strings for all effects as (video_filters, audio_filters)."""
+        if self._filter_cache is None:
+            self._filter_cache = self._build_effects_filter_string()
+        return self._filter_cache
+
+    def _build_effects_filter_string(self):
         video_filters = []
         audio_filters = []
         for effect in self.effects:
@@ -213,41 +929,86 @@ class MediaItem:
         audio_str = ",".join(audio_filters) if audio_filters else ""
         return (video_str, audio_str)
 
+    def get_preview_video_filter(self, uniform=False):
+        """Get the memoized preview filter chain, before any hardware upload step
+
+        With uniform set, videos are always brought to 24 fps and 480 wide so
+        Preview All segments line up; otherwise no-op steps are left out.
+        """
+        if uniform not in self._vf_cache:
+            self._vf_cache[uniform] = self._build_preview_video_filter(uniform)
+        return self._vf_cache[uniform]
+
+    def _build_preview_video_filter(self, uniform):
+        video_effects, _ = self.get_effects_filter_string()
+        if self.is_image:
+            # The image is read at the preview rate, so no fps step is needed
+            return loop_still_image(
+                preview_filter_chain(self.manual_rotation, video_effects, frame_rate=24),
+                video_effects,
+            )
+        degrees = self.rotation + self.manual_rotation
+        if uniform:
+            return preview_filter_chain(degrees, video_effects)
+        # Small or low frame rate sources skip the steps that would be no-ops;
+        # any speed change alters the output rate, so fps stays in that case
+        retimed = bool(video_effects) or self.playback_speed != 1.0
+        return preview_filter_chain(
+            degrees,
+            video_effects,
+            size=(self.width, self.height),
+            frame_rate=None if retimed else parse_frame_rate(self.fps),
+        )
+
+    def is_untrimmed(self):
+        """Check if this item covers its whole source file"""
+        if self.is_image or self.start_time > 0:
+            return False
+        return self.end_time is None or self.end_time >= self.duration
+
+    def can_stream_copy(self):
+        """Check if this item can be cut from its source without re-encoding"""
+        if self.is_image or self.effects or self.playback_speed != 1.0:
+            return False
+        return (self.rotation + self.manual_rotation) % 360 == 0
+
 
 class VideoClip(MediaItem):
-    def __init__(self, file_path):
+    def __init__(self, file_path, probe=None):
         super().__init__(file_path, is_image=False)
         self.codec = None
         self.bit_depth = None
         self.width = 0
         self.height = 0
         self.pixel_format = "yuv420p"
+        self.fps = None
+        self.audio_codec = None
+        self.audio_sample_rate = None
+        self.audio_channels = None
 
         try:
-            # Use ffprobe to get video metadata
-            cmd = [
-                "ffprobe",
-                "-v", "error",
-                "-print_format", "json",
-                "-show_format",
-                "-show_streams",
-                file_path,
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                raise ValueError(f"ffprobe failed: {result.stderr}")
-
-            probe = json.loads(result.stdout)
+            # Reuse metadata probed ahead of time when the caller has it
+            if probe is None:
+                probe = probe_media(file_path)
             self.duration = float(probe["format"]["duration"])
             self.end_time = self.duration
 
+            video_found = False
             for stream in probe["streams"]:
-                if stream["codec_type"] == "video":
+                # Remember the first audio stream for stream-copy compatibility checks
+                if stream["codec_type"] == "audio" and self.audio_codec is None:
+                    self.has_audio = True
+                    self.audio_codec = stream.get("codec_name", "unknown")
+                    self.audio_sample_rate = stream.get("sample_rate")
+                    self.audio_channels = stream.get("channels")
+                elif stream["codec_type"] == "video" and not video_found:
+                    video_found = True
                     self.codec = stream.get("codec_name", "unknown")
                     self.bit_depth = int(stream.get("bits_per_raw_sample", 8))
                     self.width = int(stream.get("width", 0))
                     self.height = int(stream.get("height", 0))
                     self.pixel_format = stream.get("pix_fmt", "yuv420p")
+                    self.fps = stream.get("r_frame_rate")
 
                     # Handle rotation metadata
                     self.rotation = 0  # Default rotation
@@ -270,7 +1031,6 @@ class VideoClip(MediaItem):
                                         self.rotation = int(rotation_val)
                                     except (ValueError, IndexError):
                                         pass
-                    break
 
             # Automatically adjust to portrait, right side up
             self.adjust_to_portrait()
@@ -278,6 +1038,42 @@ class VideoClip(MediaItem):
         except Exception as e:
             raise ValueError(f"Failed to probe {file_path}: {str(e)}")
 
+    @staticmethod
+    def probe_file(file_path):
+        """Probe ahead of construction so imports can run probes in parallel"""
+        try:
+            return probe_media(file_path)
+        except Exception as e:
+            raise ValueError(f"Failed to probe {file_path}: {str(e)}")
+
+    def matches_preview_format(self):
+        """Check if re-encoding this clip for a preview would leave its streams as they are"""
+        if not (self.can_stream_copy() and self.is_untrimmed()):
+            return False
+        frame_rate = parse_frame_rate(self.fps)
+        return (
+            self.codec == "h264"
+            and self.pixel_format == "yuv420p"
+            # Same tests preview_filter_chain uses to skip its fps and scale steps
+            and frame_rate is not None and frame_rate <= 24
+            and 0 < self.width <= 480
+            and self.width % 2 == 0 and self.height % 2 == 0
+            and (not self.has_audio or self.audio_codec == "aac")
+        )
+
+    def get_stream_signature(self):
+        """Get the stream parameters that must match for a stream-copy concat"""
+        return (
+            self.codec,
+            self.width,
+            self.height,
+            self.fps,
+            self.pixel_format,
+            self.audio_codec,
+            self.audio_sample_rate,
+            self.audio_channels,
+        )
+
     def adjust_to_portrait(self):
         """Automatically adjust rotation to make the video portrait and right side up."""
         # Normalize current rotation to 0-360
@@ -323,29 +1119,27 @@ class VideoClip(MediaItem):
 
 
 class ImageItem(MediaItem):
-    def __init__(self, file_path):
+    def __init__(self, file_path, probe=None):
         super().__init__(file_path, is_image=True)
         self.width = 0
         self.height = 0
 
-        try:
-            # Use subprocess for stability with ffprobe
-            cmd = [
-                "ffprobe",
-                "-v",
-                "error",
-                "-print_format",
-                "json",
-                "-show_format",
-                "-show_streams",
-                file_path,
-            ]
+        # For images, duration is the display duration
+        self.duration = self.display_duration
+        self.end_time = self.display_duration
 
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                raise ValueError(f"ffprobe failed: {result.stderr}")
+        if probe is None:
+            # Qt reads the size from the image header without starting a process
+            size = QImageReader(file_path).size()
+            if size.isValid():
+                self.width = size.width()
+                self.height = size.height()
+                return
 
-            probe = json.loads(result.stdout)
+        try:
+            # Fall back to ffprobe for formats Qt has no plugin for
+            if probe is None:
+                probe = probe_media(file_path)
 
             for stream in probe["streams"]:
                 if stream["codec_type"] == "video":
@@ -353,10 +1147,16 @@ class ImageItem(MediaItem):
                     self.height = int(stream.get("height", 0))
                     break
 
-            # For images, duration is the display duration
-            self.duration = self.display_duration
-            self.end_time = self.display_duration
+        except Exception as e:
+            raise ValueError(f"Failed to probe image {file_path}: {str(e)}")
 
+    @staticmethod
+    def probe_file(file_path):
+        """Probe ahead of construction, skipping ffprobe when Qt can read the image"""
+        if QImageReader(file_path).size().isValid():
+            return None
+        try:
+            return probe_media(file_path)
         except Exception as e:
             raise ValueError(f"Failed to probe image {file_path}: {str(e)}")
 
@@ -401,6 +1201,72 @@ class ImageDurationDialog(QDialog):
         layout.addLayout(buttons_layout)
 
 
+class FrameGrabberSignals(QObject):
+    """Signals for FrameGrabber, since QRunnable is not a QObject"""
+
+    frame_ready = pyqtSignal(int, bytes)  # request id, PNG data
+
+
+class FrameGrabber(QRunnable):
+    """Thread pool task that grabs one frame for a trim thumbnail"""
+
+    def __init__(self, request_id, file_path, time_pos):
+        super().__init__()
+        self.request_id = request_id
+        self.file_path = file_path
+        self.time_pos = time_pos
+        self.signals = FrameGrabberSignals()
+
+    def run(self):
+        data = grab_frame(self.file_path, self.time_pos)
+        if data:
+            self.signals.frame_ready.emit(self.request_id, data)
+
+
+class ThumbStripGrabber(QRunnable):
+    """Thread pool task that builds the scrub strip for a clip"""
+
+    def __init__(self, media_item):
+        super().__init__()
+        self.media_item = media_item
+        self.signals = FrameGrabberSignals()
+
+    def run(self):
+        key = self.media_item.source_key
+        data = get_thumb_strip(key)
+        if data is None:
+            data = grab_thumb_strip(self.media_item.file_path, self.media_item.duration)
+            if data:
+                cache_thumb_strip(key, data)
+        if data:
+            self.signals.frame_ready.emit(0, data)
+
+
+class PreviewTaskSignals(QObject):
+    """Signals for PreviewTask, since QRunnable is not a QObject"""
+
+    finished = pyqtSignal(str, str)  # preview filename when queued, result
+
+
+class PreviewTask(QRunnable):
+    """Thread pool task that renders item previews in the background"""
+
+    def __init__(self, worker, media_items):
+        super().__init__()
+        self.worker = worker
+        self.media_items = media_items
+        self.preview_names = [item.get_preview_filename() for item in media_items]
+        self.signals = PreviewTaskSignals()
+
+    def run(self):
+        if len(self.media_items) > 1:
+            results = self.worker.create_preview_batch(self.media_items)
+        else:
+            results = {self.preview_names[0]: self.worker.create_preview(self.media_items[0])}
+        for name in self.preview_names:
+            self.signals.finished.emit(name, str(results.get(name, "")))
+
+
 class EditDialog(QDialog):
     """Dialog for editing media properties"""
 
@@ -415,6 +1281,13 @@ class EditDialog(QDialog):
         # Create tabs for different edit options
         tab_widget = QTabWidget()
 
+        # Coalesce slider ticks into at most one trim update per frame
+        self.pending_trim = {}
+        self.trim_timer = QTimer(self)
+        self.trim_timer.setSingleShot(True)
+        self.trim_timer.setInterval(16)
+        self.trim_timer.timeout.connect(self.apply_trim)
+
         # Trim tab for videos
         if not media_item.is_image:
             trim_tab = QWidget()
@@ -446,6 +1319,27 @@ class EditDialog(QDialog):
             end_layout.addWidget(self.end_slider, 1)
             trim_layout.addLayout(end_layout)
 
+            # Frame thumbnail at the trim point being adjusted
+            self.thumbnail_label = QLabel()
+            self.thumbnail_label.setAlignment(Qt.AlignCenter)
+            self.thumbnail_label.setMinimumHeight(160)
+            trim_layout.addWidget(self.thumbnail_label)
+
+            # Only grab a frame once the slider settles
+            self.thumbnail_request = 0
+            self.thumbnail_time = media_item.start_time
+            self.thumbnail_timer = QTimer(self)
+            self.thumbnail_timer.setSingleShot(True)
+            self.thumbnail_timer.setInterval(100)
+            self.thumbnail_timer.timeout.connect(self.request_thumbnail)
+            self.thumbnail_timer.start()
+
+            # Frame strip for instant feedback while a slider is dragged
+            self.thumb_strip = None
+            strip_grabber = ThumbStripGrabber(media_item)
+            strip_grabber.signals.frame_ready.connect(self.set_thumb_strip)
+            QThreadPool.globalInstance().start(strip_grabber)
+
             tab_widget.addTab(trim_tab, "Trim")
 
         # Duration tab for images
@@ -538,28 +1432,96 @@ class EditDialog(QDialog):
 
     def update_start_time(self, value):
         """Update start time slider"""
-        start_time = value / 1000.0
-        end_time = self.media_item.end_time or self.media_item.duration
-
-        # Make sure start time is valid
-        if start_time >= end_time:
-            start_time = end_time - 0.1
-            self.start_slider.setValue(int(start_time * 1000))
-
-        self.media_item.start_time = start_time
-        self.start_label.setText(f"Start: {start_time:.2f} sec")
+        self.pending_trim["start"] = value
+        self.trim_timer.start()
 
     def update_end_time(self, value):
         """Update end time slider"""
-        end_time = value / 1000.0
+        self.pending_trim["end"] = value
+        self.trim_timer.start()
 
-        # Make sure end time is valid
-        if end_time <= self.media_item.start_time:
-            end_time = self.media_item.start_time + 0.1
-            self.end_slider.setValue(int(end_time * 1000))
+    def apply_trim(self):
+        """Apply the latest slider positions to the media item and labels"""
+        pending, self.pending_trim = self.pending_trim, {}
 
-        self.media_item.end_time = end_time
-        self.end_label.setText(f"End: {end_time:.2f} sec")
+        if "start" in pending:
+            start_time = pending["start"] / 1000.0
+            end_time = self.media_item.end_time or self.media_item.duration
+
+            # Make sure start time is valid
+            if start_time >= end_time:
+                start_time = end_time - 0.1
+                self.start_slider.setValue(int(start_time * 1000))
+
+            self.media_item.start_time = start_time
+            self.start_label.setText(f"Start: {start_time:.2f} sec")
+            self.schedule_thumbnail(start_time)
+
+        if "end" in pending:
+            end_time = pending["end"] / 1000.0
+
+            # Make sure end time is valid
+            if end_time <= self.media_item.start_time:
+                end_time = self.media_item.start_time + 0.1
+                self.end_slider.setValue(int(end_time * 1000))
+
+            self.media_item.end_time = end_time
+            self.end_label.setText(f"End: {end_time:.2f} sec")
+            self.schedule_thumbnail(end_time)
+
+    def accept(self):
+        """Apply any slider movement still waiting on the trim timer"""
+        if self.pending_trim:
+            self.trim_timer.stop()
+            self.apply_trim()
+        super().accept()
+
+    def schedule_thumbnail(self, time_pos):
+        """Show the frame at time_pos once the slider stops moving"""
+        self.thumbnail_time = time_pos
+        if self.thumb_strip is not None and self.media_item.duration:
+            # Show the nearest strip frame now and drop any exact grab in flight
+            self.thumbnail_request += 1
+            tile_width = self.thumb_strip.width() // THUMB_STRIP_COLUMNS
+            column = int(time_pos / self.media_item.duration * THUMB_STRIP_COLUMNS)
+            column = max(0, min(THUMB_STRIP_COLUMNS - 1, column))
+            self.set_thumbnail_pixmap(
+                self.thumb_strip.copy(
+                    column * tile_width, 0, tile_width, self.thumb_strip.height()
+                )
+            )
+        self.thumbnail_timer.start()
+
+    def set_thumb_strip(self, _, data):
+        """Keep the decoded scrub strip for slider feedback"""
+        pixmap = QPixmap()
+        if pixmap.loadFromData(data, "JPEG"):
+            self.thumb_strip = pixmap
+
+    def request_thumbnail(self):
+        """Grab the thumbnail frame on the thread pool"""
+        self.thumbnail_request += 1
+        grabber = FrameGrabber(
+            self.thumbnail_request, self.media_item.file_path, self.thumbnail_time
+        )
+        grabber.signals.frame_ready.connect(self.show_thumbnail)
+        QThreadPool.globalInstance().start(grabber)
+
+    def show_thumbnail(self, request_id, data):
+        """Display a grabbed frame unless a newer one was requested"""
+        if request_id != self.thumbnail_request:
+            return
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(data, "PNG"):
+            return
+        self.set_thumbnail_pixmap(pixmap)
+
+    def set_thumbnail_pixmap(self, pixmap):
+        """Show a frame turned the way the clip will be exported"""
+        rotation = (self.media_item.rotation + self.media_item.manual_rotation) % 360
+        if rotation:
+            pixmap = pixmap.transformed(QTransform().rotate(rotation))
+        self.thumbnail_label.setPixmap(pixmap)
 
     def update_duration(self, value):
         """Update image duration"""
@@ -626,6 +1588,7 @@ class ProcessingWorker(QObject):
     progress = pyqtSignal(int, str)
     finished = pyqtSignal(str, object)  # task, result
     error = pyqtSignal(str, str)  # task, error message
+    preview_started = pyqtSignal(str)  # path of a preview that is playable while still being written
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -633,137 +1596,387 @@ class ProcessingWorker(QObject):
         self.music_file = None
         self.music_volume = 0.7  # Default 70% volume
         self.music_tracks = []  # List of MusicTrack objects
+        self.use_gpu = True  # Allow hardware encoders when available
+        self.parallel_jobs = 1  # Calls into this worker that may run at the same time
+        # Write ends of the pipes run_process calls wait on, written to on
+        # abort so waiting threads wake up straight away
+        self._abort_pipes = set()
+        self._abort_pipes_lock = threading.Lock()
+        self._last_progress = (None, None, 0.0)  # Percent, message, monotonic time
+
+    def report_progress(self, percent, message):
+        """Emit a progress update, dropping repeats and same-message updates within 0.2s"""
+        last_percent, last_message, last_time = self._last_progress
+        now = time.monotonic()
+        if message == last_message and percent != 100:
+            if percent == last_percent or now - last_time < 0.2:
+                return
+        self._last_progress = (percent, message, now)
+        self.progress.emit(percent, message)
 
     def abort(self):
         """Signal the worker to abort processing"""
         self._abort = True
+        with self._abort_pipes_lock:
+            for fd in self._abort_pipes:
+                try:
+                    os.write(fd, b"x")
+                except OSError:
+                    pass
+
+    def run_process(self, cmd, timeout=None, input=None):
+        """Run a command until it exits, is aborted or times out.
+
+        input is optional bytes for the command's stdin.
+        Returns (status, returncode, stderr) with status "done", "aborted" or "timeout".
+        """
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL if input is None else subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        deadline = None if timeout is None else time.monotonic() + timeout
+        status = "done"
+        if os.name == "nt":
+            # select() only works on sockets there, so fall back to short waits
+            while True:
+                try:
+                    _, stderr = process.communicate(input, timeout=0.25)
+                    break
+                except subprocess.TimeoutExpired:
+                    # The input is already on its way, it can't be passed again
+                    input = None
+                    if self._abort:
+                        status = "aborted"
+                    elif deadline is not None and time.monotonic() > deadline:
+                        status = "timeout"
+                    else:
+                        continue
+                    process.terminate()
+        else:
+            if input is not None:
+                # ffmpeg reads a list like this whole when it opens the input
+                try:
+                    process.stdin.write(input)
+                except BrokenPipeError:
+                    pass  # Exited early, the error is on stderr
+                finally:
+                    try:
+                        process.stdin.close()
+                    except BrokenPipeError:
+                        pass
+            # Only the tail is kept, a chatty ffmpeg can't grow this without bound
+            chunks = deque(maxlen=16)
+            # A pipe per call, so workers that are never deleted don't hold fds
+            abort_r, abort_w = os.pipe()
+            with self._abort_pipes_lock:
+                self._abort_pipes.add(abort_w)
+            if self._abort:
+                status = "aborted"  # Aborted before the pipe could be written to
+            try:
+                with selectors.DefaultSelector() as selector:
+                    selector.register(abort_r, selectors.EVENT_READ)
+                    selector.register(process.stderr, selectors.EVENT_READ)
+                    # stderr reaches EOF once ffmpeg exits
+                    while status == "done" and len(selector.get_map()) > 1:
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            status = "timeout"
+                            break
+                        for key, _ in selector.select(remaining):
+                            if key.fd == abort_r:
+                                status = "aborted"
+                                break
+                            data = os.read(key.fd, 65536)
+                            if data:
+                                chunks.append(data)
+                            else:
+                                selector.unregister(key.fileobj)
+            finally:
+                with self._abort_pipes_lock:
+                    self._abort_pipes.discard(abort_w)
+                os.close(abort_r)
+                os.close(abort_w)
+            process.stderr.close()
+            if status != "done":
+                stop_process(process)
+            else:
+                process.wait()
+            stderr = b"".join(chunks)
+        return status, process.returncode, stderr.decode(errors="replace").strip()
+
+    def get_stream_copy_command(self, media_item, output_file, container="mpegts", output_args=()):
+        """Build an ffmpeg command that cuts a clip from its source without re-encoding"""
+        duration = (media_item.end_time or media_item.duration) - media_item.start_time
+        cmd = [
+            "ffmpeg", "-y", "-v", "error",
+            "-ss", str(media_item.start_time),
+            "-i", media_item.file_path,
+            "-t", str(max(0.1, duration)),
+            # Skip data and subtitle tracks (e.g. phone metadata) that break concat
+            "-map", "0:v:0", "-map", "0:a:0?",
+            "-c", "copy",
+            "-avoid_negative_ts", "make_zero",
+        ]
+        # MPEG-TS needs Annex B bitstreams, MP4 sources store them length-prefixed
+        annexb_filter = ANNEXB_BITSTREAM_FILTERS.get(media_item.codec)
+        if container == "mpegts" and annexb_filter:
+            cmd.extend(["-bsf:v", annexb_filter])
+        cmd.extend([*output_args, "-f", container, output_file])
+        return cmd
 
     def create_preview(self, media_item):
+        """Create a preview for a single item, one thread at a time per preview file."""
+        # Nothing changed since the last render: skip the lock and the full lookup
+        preview_file = media_item.get_preview_filename()
+        if (
+            media_item.preview_status == "ready"
+            and media_item.preview_file == preview_file
+            and file_size(preview_file) > 1000
+        ):
+            return preview_file
+        with preview_file_lock(preview_file):
+            return self.render_preview(media_item)
+
+    def get_preview_args(self, media_item, input_index, encoder, filter_scripts, threads=None):
+        """Build the (input, output) ffmpeg args that re-encode one item preview"""
+        _, audio_effects = media_item.get_effects_filter_string()
+        _, upload_filter = hw_upload_args(encoder)
+        vf = media_item.get_preview_video_filter()
+
+        if media_item.is_image:
+            duration = max(0.1, media_item.display_duration)
+            input_args = ["-framerate", "24", "-i", media_item.file_path]
+            output_args = [
+                "-map", f"{input_index}:v:0",
+                "-t", str(duration), "-an",
+                *video_filter_args(vf + upload_filter, TEMP_DIR, filter_scripts),
+                *video_encoder_args(encoder, threads=threads),
+                *PREVIEW_MOVFLAGS,
+            ]
+            return input_args, output_args
+
+        duration = (media_item.end_time or media_item.duration) - media_item.start_time
+        if duration <= 0:
+            print(f"Warning: Invalid duration {duration} for {media_item.file_path}, setting to 0.1")
+            duration = 0.1
+            media_item.end_time = media_item.start_time + duration
+
+        # Seek on the input so ffmpeg jumps to the start instead of decoding up to it
+        input_args = [
+            *hw_decode_args(self.use_gpu),
+            *source_probe_args(media_item.file_path),
+            "-ss", str(media_item.start_time),
+            "-i", media_item.file_path,
+        ]
+        output_args = [
+            "-map", f"{input_index}:v:0",
+            "-t", str(duration),
+            *video_filter_args(vf + upload_filter, TEMP_DIR, filter_scripts),
+            *video_encoder_args(encoder, threads=threads),
+        ]
+        if media_item.has_audio:
+            output_args.extend(["-map", f"{input_index}:a:0"])
+            if audio_effects:
+                output_args.extend(["-af", audio_effects])
+            output_args.extend(["-c:a", "aac", "-b:a", "64k"])
+        output_args.extend(PREVIEW_MOVFLAGS)
+        return input_args, output_args
+
+    def create_preview_batch(self, media_items):
+        """Render previews for several items from one ffmpeg process, returning {filename: result}"""
+        results = {}
+        batch = []
+        locks = []
+        filter_scripts = []
+        try:
+            for media_item in media_items:
+                preview_file = media_item.get_preview_filename()
+                lock = preview_file_lock(preview_file)
+                if media_item.can_stream_copy() or file_size(preview_file) >= 0:
+                    continue  # Remuxes and earlier renders are cheap one at a time
+                if any(preview_file == queued for _, queued in batch):
+                    continue
+                if not lock.acquire(blocking=False):
+                    continue  # Already being rendered elsewhere
+                locks.append(lock)
+                batch.append((media_item, preview_file))
+
+            if len(batch) > 1:
+                encoder = select_video_encoder(self.use_gpu, allow_vaapi=True)
+                hw_input_args, _ = hw_upload_args(encoder)
+                cmd = ["ffmpeg", "-y", "-v", "error", *hw_input_args]
+                outputs = []
+                threads = threads_per_encoder(self.parallel_jobs * len(batch))
+                for index, (media_item, preview_file) in enumerate(batch):
+                    input_args, output_args = self.get_preview_args(
+                        media_item, index, encoder, filter_scripts, threads
+                    )
+                    cmd.extend(input_args)
+                    outputs.extend([*output_args, preview_file])
+                cmd.extend(outputs)
+
+                print(f"Executing ffmpeg command: {' '.join(cmd)}")
+                status, returncode, stderr = self.run_process(cmd)
+                if status == "aborted":
+                    for _, preview_file in batch:
+                        discard_partial_preview(preview_file)
+                    return {preview_file: "Aborted" for _, preview_file in batch}
+
+                if returncode != 0:
+                    print(f"Batch preview error: {stderr or 'No error details'}")
+                    for _, preview_file in batch:
+                        discard_partial_preview(preview_file)
+                else:
+                    for media_item, preview_file in batch:
+                        if file_size(preview_file) <= 1000:
+                            continue
+                        results[preview_file] = preview_file
+                        if preview_file == media_item.get_preview_filename():
+                            media_item.preview_file = preview_file
+                            media_item.preview_status = "ready"
+                            media_item.has_pending_changes = False
+                    trim_preview_cache()
+        finally:
+            for lock in locks:
+                lock.release()
+            remove_filter_scripts(filter_scripts)
+
+        # Whatever the batch did not produce goes through the single-item path
+        for media_item in media_items:
+            preview_file = media_item.get_preview_filename()
+            if preview_file not in results:
+                results[preview_file] = str(self.create_preview(media_item))
+        return results
+
+    def render_preview(self, media_item, reencode=False):
         """Create a preview for a single item with robust error handling and speed adjustment."""
+        filter_scripts = []
         try:
             if self._abort:
                 return "Aborted"
 
+            # Reuse any finished preview rendered with the same settings
             preview_file = media_item.get_preview_filename()
-            if media_item.preview_file and os.path.exists(media_item.preview_file):
-                if os.path.getsize(media_item.preview_file) > 1000:
+            existing_size = file_size(preview_file)
+            if existing_size >= 0:
+                if existing_size > 1000:
+                    os.utime(preview_file)  # Mark as recently used
+                    media_item.preview_file = preview_file
                     media_item.preview_status = "ready"
                     media_item.has_pending_changes = False
-                    return media_item.preview_file
+                    return preview_file
                 else:
                     try:
-                        os.unlink(media_item.preview_file)
+                        os.unlink(preview_file)
                     except Exception as e:
                         print(f"Warning: Failed to delete invalid preview file: {e}")
                     media_item.preview_file = None
                     media_item.preview_status = "none"
 
             os.makedirs(os.path.dirname(preview_file), exist_ok=True)
-            self.progress.emit(10, f"Processing {os.path.basename(media_item.file_path)}...")
+            self.report_progress(10, f"Processing {os.path.basename(media_item.file_path)}...")
 
-            # Get separate video and audio filters
-            video_effects, audio_effects = media_item.get_effects_filter_string()
+            encoder = select_video_encoder(self.use_gpu, allow_vaapi=True)
+            hw_input_args, _ = hw_upload_args(encoder)
 
-            cmd = ["ffmpeg", "-y", "-v", "error"]
-            if media_item.is_image:
-                vf = "scale=480:-2"
-                if media_item.manual_rotation != 0:
-                    rotation = f"rotate={media_item.manual_rotation*math.pi/180}"
-                    vf = f"{rotation},{vf}"
-                if video_effects:
-                    vf = f"{video_effects},{vf}"
-                duration = max(0.1, media_item.display_duration)
-                cmd.extend([
-                    "-loop", "1", "-i", media_item.file_path,
-                    "-t", str(duration),
-                    "-vf", vf,
-                    "-c:v", "libx264", "-preset", "ultrafast", "-crf", "30",
-                    "-pix_fmt", "yuv420p", preview_file
-                ])
+            if media_item.can_stream_copy() and not reencode:
+                # Untouched clips only need a remux
+                cmd = self.get_stream_copy_command(
+                    media_item, preview_file, "mp4", PREVIEW_MOVFLAGS
+                )
             else:
-                has_audio = False
-                try:
-                    probe = subprocess.run(
-                        ["ffprobe", "-v", "error", "-show_streams", "-select_streams", "a", media_item.file_path],
-                        capture_output=True, text=True
-                    )
-                    has_audio = "codec_name" in probe.stdout
-                except Exception as e:
-                    print(f"Warning: Failed to probe audio for {media_item.file_path}: {e}")
-
-                vf = "scale=480:-2,fps=24"
-                total_rotation = (media_item.rotation + media_item.manual_rotation) % 360
-                if total_rotation != 0:
-                    rotation_filter = ""
-                    if total_rotation == 90:
-                        rotation_filter = "transpose=1,"
-                    elif total_rotation == 180:
-                        rotation_filter = "transpose=2,transpose=2,"
-                    elif total_rotation == 270:
-                        rotation_filter = "transpose=2,"
-                    vf = f"{rotation_filter}{vf}"
-                if video_effects:
-                    vf = f"{video_effects},{vf}"
-
-                duration = (media_item.end_time or media_item.duration) - media_item.start_time
-                if duration <= 0:
-                    print(f"Warning: Invalid duration {duration} for {media_item.file_path}, setting to 0.1")
-                    duration = 0.1
-                    media_item.end_time = media_item.start_time + duration
+                input_args, output_args = self.get_preview_args(
+                    media_item, 0, encoder, filter_scripts, threads_per_encoder(self.parallel_jobs)
+                )
+                cmd = [
+                    "ffmpeg", "-y", "-v", "error", *hw_input_args,
+                    *input_args, *output_args, preview_file,
+                ]
 
-                cmd.extend([
-                    "-i", media_item.file_path,
-                    "-ss", str(media_item.start_time),
-                    "-t", str(duration),
-                    "-vf", vf,
-                    "-c:v", "libx264", "-preset", "ultrafast", "-crf", "30"
-                ])
-                if has_audio:
-                    if audio_effects:
-                        cmd.extend(["-af", audio_effects])
-                    cmd.extend(["-c:a", "aac", "-b:a", "64k"])
-                cmd.extend(["-pix_fmt", "yuv420p", preview_file])
+            # Report progress as key=value lines instead of the stats line
+            cmd[1:1] = ["-progress", "pipe:1", "-nostats"]
+            if media_item.is_image:
+                expected = max(0.1, media_item.display_duration)
+            else:
+                expected = (media_item.end_time or media_item.duration) - media_item.start_time
+                expected = max(0.1, expected / (media_item.playback_speed or 1.0))
 
             print(f"Executing ffmpeg command: {' '.join(cmd)}")
             process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                universal_newlines=True,
-                bufsize=1
             )
+            # Drain stderr next to the progress output so a chatty ffmpeg can't
+            # block on a full pipe; only the last few chunks are kept for errors.
+            # Both pipes stay binary, stderr is only decoded when reporting a failure
+            stderr_tail = deque(maxlen=16)
+            stderr_reader = threading.Thread(
+                target=lambda: stderr_tail.extend(iter(lambda: process.stderr.read(4096), b"")),
+                daemon=True,
+            )
+            stderr_reader.start()
 
-            for line in iter(process.stdout.readline, ""):
+            # Fragmented output can be played before ffmpeg finishes writing it
+            started = False
+            last_emit = 0.0
+            for line in process.stdout:
                 if self._abort:
-                    process.terminate()
+                    stop_process(process)
+                    # A partial file would be mistaken for a finished preview later
+                    discard_partial_preview(preview_file)
                     media_item.preview_status = "none"
                     return "Aborted"
-                if "time=" in line:
+                if not started:
                     try:
-                        time_parts = line.split("time=")[1].split()[0].split(":")
-                        if len(time_parts) == 3:
-                            hours, minutes, seconds = time_parts
-                            current_sec = float(hours) * 3600 + float(minutes) * 60 + float(seconds.replace(",", "."))
-                            total_sec = duration
-                            if total_sec > 0:
-                                progress = min(int((current_sec / total_sec) * 80) + 10, 90)
-                                self.progress.emit(progress, f"Processing {os.path.basename(media_item.file_path)}...")
-                    except Exception as e:
-                        print(f"Warning: Failed to parse ffmpeg progress: {e}")
+                        started = os.path.getsize(preview_file) >= PREVIEW_START_BYTES
+                    except OSError:
+                        pass
+                    if started:
+                        self.preview_started.emit(preview_file)
+                if not line.startswith(b"out_time_us="):
+                    continue
+                # Throttle to a few updates a second
+                now = time.monotonic()
+                if now - last_emit < 0.25:
+                    continue
+                last_emit = now
+                try:
+                    seconds = int(line[12:]) / 1e6
+                except ValueError:
+                    continue  # N/A before the first frame
+                self.report_progress(
+                    10 + int(85 * min(1.0, seconds / expected)),
+                    f"Processing {os.path.basename(media_item.file_path)}...",
+                )
 
-            stdout, stderr = process.communicate()
+            process.wait()
+            stderr_reader.join()
             if process.returncode != 0:
-                self.progress.emit(0, "Error processing file")
+                stderr = b"".join(stderr_tail).decode(errors="replace")
+                discard_partial_preview(preview_file)
+                if media_item.can_stream_copy() and not reencode:
+                    # Streams the mp4 muxer rejects (ProRes, PCM audio) need a re-encode
+                    print(f"Warning: Remux failed, re-encoding preview: {stderr.strip()}")
+                    return self.render_preview(media_item, reencode=True)
+                self.report_progress(0, "Error processing file")
                 media_item.preview_status = "error"
                 error_msg = f"ffmpeg error {process.returncode}: {stderr.strip() or 'No error details available'}"
                 print(error_msg)
                 return f"Error: {error_msg}"
 
-            self.progress.emit(100, "Preview ready")
-            if os.path.exists(preview_file) and os.path.getsize(preview_file) > 1000:
+            self.report_progress(100, "Preview ready")
+            if preview_file != media_item.get_preview_filename():
+                # The item was edited while this preview was rendering
+                media_item.preview_status = "none"
+                return "Error: Item changed during preview"
+            if file_size(preview_file) > 1000:
                 media_item.preview_file = preview_file
                 media_item.preview_status = "ready"
                 media_item.has_pending_changes = False
+                trim_preview_cache(keep=preview_file)
                 return preview_file
             else:
                 media_item.preview_status = "error"
@@ -772,10 +1985,12 @@ class ProcessingWorker(QObject):
                 return error_msg
 
         except Exception as e:
-            self.progress.emit(0, f"Error: {str(e)}")
+            self.report_progress(0, f"Error: {str(e)}")
             media_item.preview_status = "error"
             print(f"Exception in create_preview: {str(e)}")
             return f"Error: {str(e)}"
+        finally:
+            remove_filter_scripts(filter_scripts)
 
     def slider_released(self):
         """Handle slider release event"""
@@ -792,37 +2007,184 @@ class ProcessingWorker(QObject):
         else:
             print(f"Progress update skipped: No active dialog for '{message}'")
 
+    def get_segment_args(
+        self, media_item, input_index, preview_duration, encoder, filter_scripts, threads=None
+    ):
+        """Build the (input, output) ffmpeg args that re-encode one preview segment"""
+        _, audio_effects = media_item.get_effects_filter_string()
+        _, upload_filter = hw_upload_args(encoder)
+        vf = media_item.get_preview_video_filter(uniform=True) + upload_filter
+
+        if media_item.is_image:
+            input_args = ["-framerate", "24", "-i", media_item.file_path]
+            output_args = [
+                "-map", f"{input_index}:v:0",
+                "-t", str(preview_duration), "-an",
+                *video_filter_args(vf, TEMP_DIR, filter_scripts),
+                *video_encoder_args(encoder, threads=threads),
+                "-f", "mp4",
+            ]
+            return input_args, output_args
+
+        input_args = [
+            *source_probe_args(media_item.file_path),
+            "-ss", str(media_item.start_time),
+            "-i", media_item.file_path,
+        ]
+        output_args = [
+            "-map", f"{input_index}:v:0",
+            "-t", str(preview_duration),
+            *video_filter_args(vf, TEMP_DIR, filter_scripts),
+            *video_encoder_args(encoder, threads=threads),
+        ]
+        # Audio presence comes from the probe done when the clip was added
+        if media_item.has_audio:
+            output_args.extend(["-map", f"{input_index}:a:0"])
+            if audio_effects:
+                output_args.extend(["-af", audio_effects])
+            output_args.extend(["-c:a", "aac", "-b:a", "96k"])
+        output_args.extend(["-f", "mp4"])
+        return input_args, output_args
+
+    def render_segment_batch(self, segments, encoder):
+        """Encode several preview segments with one ffmpeg process, returning the paths made"""
+        filter_scripts = []
+        try:
+            cmd = ["ffmpeg", "-y", "-v", "error"]
+            outputs = []
+            threads = threads_per_encoder(len(segments))
+            for index, (media_item, temp_preview, preview_duration) in enumerate(segments):
+                input_args, output_args = self.get_segment_args(
+                    media_item, index, preview_duration, encoder, filter_scripts, threads
+                )
+                cmd.extend(input_args)
+                outputs.extend([*output_args, temp_preview])
+            cmd.extend(outputs)
+
+            print(f"Executing ffmpeg command: {' '.join(cmd)}")
+            max_processing_time = max(60, sum(segment[2] for segment in segments) * 2)
+            status, returncode, stderr = self.run_process(cmd, max_processing_time)
+            if status == "aborted":
+                release_segments([segment[1] for segment in segments])
+                return None
+            if status == "timeout":
+                print(f"Batch processing timed out after {max_processing_time} seconds")
+
+            if returncode != 0:
+                # Fall back to encoding the segments one by one
+                print(f"Batch segment error: {stderr or 'No error details'}")
+                return set()
+
+            rendered = set()
+            for _, temp_preview, _ in segments:
+                if file_size(temp_preview) > 1000:
+                    cache_segment(temp_preview)
+                    rendered.add(temp_preview)
+            return rendered
+        finally:
+            remove_filter_scripts(filter_scripts)
+
+    def encode_segment(
+        self, media_item, temp_preview, preview_duration, encoder, stream_copy, container, threads=None
+    ):
+        """Encode one Preview All segment in its own ffmpeg process, returning its path or None"""
+        filter_scripts = []
+        try:
+            if self._abort:
+                return None
+            if stream_copy:
+                # Cut the clip straight from the source
+                cmd = self.get_stream_copy_command(media_item, temp_preview, container)
+            else:
+                input_args, output_args = self.get_segment_args(
+                    media_item, 0, preview_duration, encoder, filter_scripts, threads
+                )
+                cmd = ["ffmpeg", "-y", "-v", "error", *input_args, *output_args, temp_preview]
+
+            # Log and run the command
+            print(f"Executing ffmpeg command: {' '.join(cmd)}")
+            max_processing_time = max(60, preview_duration * 2)
+            status, returncode, stderr = self.run_process(cmd, max_processing_time)
+            if status == "aborted":
+                discard_partial_preview(temp_preview)
+                return None
+            if status == "timeout":
+                print(f"Processing timeout for {media_item.file_path} after {max_processing_time} seconds")
+
+            if returncode != 0:
+                error_msg = f"Error creating preview for {media_item.file_path}: {stderr or 'No error details'}"
+                print(error_msg)
+                return None
+
+            if file_size(temp_preview) > 1000:
+                return temp_preview
+            print(f"Error: Temp preview file {temp_preview} is invalid or empty")
+            return None
+        finally:
+            remove_filter_scripts(filter_scripts)
+
+    def music_output_args(self):
+        """Get the ffmpeg args that mix the background music into input 0, or None without music
+
+        The music inputs come first, so these go after input 0 and before the output.
+        """
+        if self.music_tracks:
+            mix = music_mix_filter(self.music_tracks)
+        elif self.music_file and os.path.exists(self.music_file):
+            # Legacy single music file
+            mix = music_mix_filter([MusicTrack(self.music_file, volume=self.music_volume)])
+        else:
+            mix = None
+        if mix is None:
+            return None
+
+        input_args, filter_complex = mix
+        return [
+            *input_args,
+            "-filter_complex", filter_complex,
+            "-map", "0:v", "-map", "[a]",
+            "-c:v", "copy", "-c:a", "aac", "-b:a", "128k",
+            "-shortest",
+        ]
+
+    def add_music(self, video_file, output_file):
+        """Mix the background music into a preview's audio in one pass, returning True on success"""
+        music_args = self.music_output_args()
+        if music_args is None:
+            return False
+
+        cmd = ["ffmpeg", "-y", "-v", "error", "-i", video_file, *music_args, output_file]
+        status, returncode, stderr = self.run_process(cmd, 60)
+        if status == "done" and returncode == 0 and file_size(output_file) > 1000:
+            return True
+        print(f"Warning: Failed to add background music: {stderr or status}")
+        discard_partial_preview(output_file)
+        return False
+
     def process_all_clips(self, items):
         """Process all clips for preview with separate video and audio filters."""
         try:
+            valid_files = []
             if not items:
                 return "No items to process"
 
-            # Use libx264 for maximum compatibility
-            best_encoder = "libx264"
-            self.progress.emit(5, f"Using CPU encoding for maximum compatibility")
-
-            # Process each item
-            valid_files = []
-            total_items = len(items)
-            total_duration = 0
+            best_encoder = select_video_encoder(self.use_gpu)
+            self.report_progress(5, f"Using {best_encoder} encoder")
 
-            for i, media_item in enumerate(items):
-                if self._abort:
-                    # Clean up any temp files
-                    for temp_file in valid_files:
-                        try:
-                            if os.path.exists(temp_file):
-                                os.unlink(temp_file)
-                        except Exception as e:
-                            print(f"Warning: Failed to clean up temp file: {e}")
-                    return "Aborted"
+            # Untouched clips with matching streams can be joined without re-encoding
+            stream_copy = can_stream_copy_items(items)
+            if stream_copy:
+                self.report_progress(5, "Clips share stream parameters, skipping re-encode")
+            # MPEG-TS segments concat cleanly, a single clip can go straight to MP4
+            segment_container = "mpegts" if stream_copy and len(items) > 1 else "mp4"
+            segment_ext = "ts" if segment_container == "mpegts" else "mp4"
 
-                self.progress.emit(
-                    int((i / total_items) * 70) + 5,
-                    f"Processing item {i+1}/{total_items}...",
-                )
+            os.makedirs(SEGMENT_DIR, exist_ok=True)
 
+            # Work out each item's segment, reusing ones from earlier previews
+            segments = []
+            total_duration = 0
+            for media_item in items:
                 # Use the full duration as specified by user edits
                 if not media_item.is_image:
                     preview_duration = (
@@ -840,935 +2202,678 @@ class ProcessingWorker(QObject):
 
                 total_duration += preview_duration
 
-                # Create a temporary preview for this item
-                temp_preview = os.path.join(
-                    TEMP_DIR, f"temp_preview_{i}_{uuid.uuid4().hex[:8]}.mp4"
+                segment_name, _ = os.path.splitext(os.path.basename(media_item.get_preview_filename()))
+                # A lone small H.264 source would come out of the encoder unchanged,
+                # so copy it. Next to encoded segments a copy would be joined with
+                # mismatched parameter sets and audio, so then everything is encoded
+                copy = stream_copy or (
+                    len(items) == 1
+                    and not media_item.is_image
+                    and media_item.matches_preview_format()
                 )
-
-                # Get separate video and audio filters
-                video_effects, audio_effects = media_item.get_effects_filter_string()
-
-                # Base command for both image and video
-                cmd = ["ffmpeg", "-y", "-v", "error"]
-
-                # Check if video has audio
-                has_audio = False
-                if not media_item.is_image:
-                    try:
-                        probe = subprocess.run(
-                            ["ffprobe", "-v", "error", "-show_streams", "-select_streams", "a", media_item.file_path],
-                            capture_output=True, text=True
-                        )
-                        has_audio = "codec_name" in probe.stdout
-                    except Exception as e:
-                        print(f"Warning: Failed to probe audio for {media_item.file_path}: {e}")
-
-                # For images
-                if media_item.is_image:
-                    vf = "scale=480:-2,fps=24"
-                    if media_item.manual_rotation != 0:
-                        rotation = f"rotate={media_item.manual_rotation*math.pi/180}"
-                        vf = f"{rotation},{vf}"
-                    if video_effects:
-                        vf = f"{video_effects},{vf}"
-                    cmd.extend([
-                        "-loop", "1", "-i", media_item.file_path,
-                        "-t", str(preview_duration),
-                        "-vf", vf,
-                        "-c:v", best_encoder, "-preset", "ultrafast", "-crf", "28",
-                        "-pix_fmt", "yuv420p", "-f", "mp4", temp_preview
-                    ])
-                else:
-                    # For videos
-                    vf = "scale=480:-2,fps=24"
-                    total_rotation = (media_item.rotation + media_item.manual_rotation) % 360
-                    if total_rotation != 0:
-                        rotation_filter = ""
-                        if total_rotation == 90:
-                            rotation_filter = "transpose=1,"
-                        elif total_rotation == 180:
-                            rotation_filter = "transpose=2,transpose=2,"
-                        elif total_rotation == 270:
-                            rotation_filter = "transpose=2,"
-                        vf = f"{rotation_filter}{vf}"
-                    if video_effects:
-                        vf = f"{video_effects},{vf}"
-
-                    cmd.extend([
-                        "-ss", str(media_item.start_time),
-                        "-i", media_item.file_path,
-                        "-t", str(preview_duration),
-                        "-vf", vf,
-                        "-c:v", best_encoder, "-preset", "ultrafast", "-crf", "28"
-                    ])
-                    if has_audio:
-                        if audio_effects:
-                            cmd.extend(["-af", audio_effects])
-                        cmd.extend(["-c:a", "aac", "-b:a", "96k"])
-                    cmd.extend(["-pix_fmt", "yuv420p", "-f", "mp4", temp_preview])
-
-                # Log and run the command
-                print(f"Executing ffmpeg command: {' '.join(cmd)}")
-                process = subprocess.Popen(
-                    cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+                encoder_tag = "copy" if copy else best_encoder
+                temp_preview = os.path.join(
+                    SEGMENT_DIR, f"{segment_name}_{encoder_tag}.{segment_ext}"
                 )
-
-                start_time = time.time()
-                max_processing_time = max(60, preview_duration * 2)
-                while process.poll() is None:
-                    if self._abort:
-                        process.terminate()
-                        try:
-                            if os.path.exists(temp_preview):
-                                os.unlink(temp_preview)
-                        except:
-                            pass
-                        for file in valid_files:
-                            try:
-                                if os.path.exists(file):
-                                    os.unlink(file)
-                            except:
-                                pass
+                segments.append((media_item, temp_preview, preview_duration, copy))
+
+            ready = {segment[1] for segment in segments if get_cached_segment(segment[1])}
+            # Identical items share a segment, so render each path only once
+            pending = []
+            for segment in segments:
+                if segment[1] not in ready and all(segment[1] != p[1] for p in pending):
+                    pending.append(segment)
+
+            # Encode missing segments several at a time from one ffmpeg process.
+            # Groups bound the command length and how many decoders and
+            # encoders are open at once on long timelines
+            to_encode = [segment[:3] for segment in pending if not segment[3]]
+            if len(to_encode) > 1:
+                for start in range(0, len(to_encode), SEGMENT_BATCH_SIZE):
+                    group = to_encode[start:start + SEGMENT_BATCH_SIZE]
+                    self.report_progress(
+                        10 + int(60 * start / len(to_encode)),
+                        f"Processing items {start + 1}-{start + len(group)} of {len(to_encode)}...",
+                    )
+                    rendered = self.render_segment_batch(group, best_encoder)
+                    if rendered is None:
                         return "Aborted"
-                    if time.time() - start_time > max_processing_time:
-                        process.terminate()
-                        print(f"Processing timeout for {media_item.file_path} after {max_processing_time} seconds")
-                        break
-                    time.sleep(0.1)
-
-                stdout, stderr = process.communicate()
-                if process.returncode != 0:
-                    error_msg = f"Error creating preview for {media_item.file_path}: {stderr.strip() or 'No error details'}"
-                    print(error_msg)
-                    continue  # Skip this file on error
+                    ready.update(rendered)
+                pending = [segment for segment in pending if segment[1] not in ready]
+
+            # Anything left (stream copies, or a failed batch) runs as separate
+            # processes in parallel, since each one only keeps a few cores busy
+            total_items = len(pending)
+            if pending:
+                # Stream copies don't open an encoder, so only the cores limit them
+                encoder = "libx264" if all(segment[3] for segment in pending) else best_encoder
+                workers = encoder_workers(encoder, len(pending))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(
+                            self.encode_segment, media_item, temp_preview, preview_duration,
+                            best_encoder, copy, segment_container, threads_per_encoder(workers),
+                        )
+                        for media_item, temp_preview, preview_duration, copy in pending
+                    ]
+                    remaining = set(futures)
+                    while remaining:
+                        done, remaining = wait(remaining, timeout=0.1, return_when=FIRST_COMPLETED)
+                        if done:
+                            finished = total_items - len(remaining)
+                            self.report_progress(
+                                int((finished / total_items) * 70) + 5,
+                                f"Processed item {finished}/{total_items}...",
+                            )
+                    # Collected in submission order so the concat order is kept
+                    for future in futures:
+                        temp_preview = future.result()
+                        if temp_preview:
+                            cache_segment(temp_preview)
+                            ready.add(temp_preview)
+                if self._abort:
+                    return "Aborted"
 
-                if os.path.exists(temp_preview) and os.path.getsize(temp_preview) > 1000:
+            for media_item, temp_preview, _, _ in segments:
+                if temp_preview in ready:
                     valid_files.append(temp_preview)
                     media_item.has_pending_changes = False
-                else:
-                    print(f"Error: Temp preview file {temp_preview} is invalid or empty")
-                    continue
 
             if not valid_files:
                 return "Failed to create any valid previews"
 
             # Handle case with only one valid file
             if len(valid_files) == 1:
-                output_file = os.path.join(TEMP_DIR, f"preview_all_{uuid.uuid4().hex}.mp4")
+                output_file = os.path.join(TEMP_DIR, unique_name("preview_all", ".mp4"))
                 if self.music_tracks or (self.music_file and os.path.exists(self.music_file)):
-                    self.progress.emit(80, "Adding background music...")
-
-                    if self.music_tracks:
-                        temp_music_file = os.path.join(TEMP_DIR, f"temp_music_{uuid.uuid4().hex[:8]}.mp3")
-                        if len(self.music_tracks) > 1:
-                            music_cmd = ["ffmpeg", "-y", "-v", "error"]
-                            music_filter = ""
-                            valid_track_count = 0
-                            for track in self.music_tracks:
-                                if os.path.exists(track.file_path):
-                                    music_cmd.extend(["-i", track.file_path])
-                                    valid_track_count += 1
-                            if valid_track_count == 0:
-                                shutil.copy(valid_files[0], output_file)
-                                return (output_file, total_duration)
-
-                            for i in range(valid_track_count):
-                                music_filter += f"[{i}:a]volume={self.music_tracks[i].volume},"
-                                if (self.music_tracks[i].start_time_in_track > 0 or self.music_tracks[i].duration):
-                                    music_filter += f"atrim=start={self.music_tracks[i].start_time_in_track}"
-                                    if self.music_tracks[i].duration:
-                                        music_filter += f":duration={self.music_tracks[i].duration}"
-                                    music_filter += ","
-                                music_filter += f"aformat=sample_fmts=fltp[a{i}];"
-                            music_filter += "".join(f"[a{i}]" for i in range(valid_track_count)) + f"amix=inputs={valid_track_count}:duration=longest[aout]"
-
-                            music_cmd.extend([
-                                "-filter_complex", music_filter,
-                                "-map", "[aout]",
-                                "-c:a", "mp3", "-b:a", "192k",
-                                temp_music_file
-                            ])
-                            music_process = subprocess.Popen(music_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                            music_process.wait(timeout=60)
-                            if not os.path.exists(temp_music_file) or os.path.getsize(temp_music_file) < 1000:
-                                print("Failed to create mixed music file")
-                                shutil.copy(valid_files[0], output_file)
-                                return (output_file, total_duration)
-                        else:
-                            temp_music_file = self.music_tracks[0].file_path if os.path.exists(self.music_tracks[0].file_path) else None
-                            if not temp_music_file:
-                                shutil.copy(valid_files[0], output_file)
-                                return (output_file, total_duration)
-
-                        final_output = os.path.join(TEMP_DIR, f"preview_all_music_{uuid.uuid4().hex}.mp4")
-                        music_add_cmd = [
-                            "ffmpeg", "-y", "-v", "error",
-                            "-i", valid_files[0], "-i", temp_music_file,
-                            "-filter_complex", "[1:a]volume=0.7[music];[0:a][music]amix=inputs=2:duration=first[a]",
-                            "-map", "0:v", "-map", "[a]",
-                            "-c:v", "copy", "-c:a", "aac", "-b:a", "128k",
-                            "-shortest", final_output
-                        ]
-                        add_process = subprocess.Popen(music_add_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                        add_process.wait(timeout=60)
-                        if os.path.exists(final_output) and os.path.getsize(final_output) > 1000:
-                            output_file = final_output
-                            for file in valid_files:
-                                try:
-                                    if os.path.exists(file):
-                                        os.unlink(file)
-                                except:
-                                    pass
-                            if len(self.music_tracks) > 1:
-                                try:
-                                    os.unlink(temp_music_file)
-                                except:
-                                    pass
-                        else:
-                            shutil.copy(valid_files[0], output_file)
+                    self.report_progress(80, "Adding background music...")
+                    final_output = os.path.join(TEMP_DIR, unique_name("preview_all_music", ".mp4"))
+                    if self.add_music(valid_files[0], final_output):
+                        output_file = final_output
+                        release_segments(valid_files)
                     else:
-                        # Legacy music file handling
-                        final_output = os.path.join(TEMP_DIR, f"preview_all_music_{uuid.uuid4().hex}.mp4")
-                        music_cmd = [
-                            "ffmpeg", "-y", "-v", "error",
-                            "-i", valid_files[0], "-i", self.music_file,
-                            "-filter_complex", f"[1:a]volume={self.music_volume}[music];[0:a][music]amix=inputs=2:duration=first[a]",
-                            "-map", "0:v", "-map", "[a]",
-                            "-c:v", "copy", "-c:a", "aac", "-b:a", "128k",
-                            "-shortest", final_output
-                        ]
-                        process = subprocess.Popen(music_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                        process.wait(timeout=60)
-                        if os.path.exists(final_output) and os.path.getsize(final_output) > 1000:
-                            output_file = final_output
-                            for file in valid_files:
-                                try:
-                                    if os.path.exists(file):
-                                        os.unlink(file)
-                                except:
-                                    pass
-                        else:
-                            shutil.copy(valid_files[0], output_file)
+                        link_or_copy(valid_files[0], output_file)
                 else:
-                    shutil.copy(valid_files[0], output_file)
+                    link_or_copy(valid_files[0], output_file)
 
-                self.progress.emit(100, "Preview ready (single clip)")
-                for file in valid_files:
-                    try:
-                        if os.path.exists(file) and file != output_file:
-                            os.unlink(file)
-                    except:
-                        pass
+                self.report_progress(100, "Preview ready (single clip)")
+                release_segments(valid_files, keep=output_file)
                 return (output_file, total_duration)
 
             # Multiple clips - concatenate them
-            self.progress.emit(80, "Combining all clips...")
-            output_file = os.path.join(TEMP_DIR, f"preview_all_{uuid.uuid4().hex}.mp4")
-            file_list = os.path.join(TEMP_DIR, f"files_{uuid.uuid4().hex}.txt")
-            with open(file_list, "w") as f:
-                for file_path in valid_files:
-                    fixed_path = file_path.replace("\\", "/")
-                    f.write(f"file '{fixed_path}'\n")
+            self.report_progress(80, "Combining all clips...")
+            output_file = os.path.join(TEMP_DIR, unique_name("preview_all", ".mp4"))
+            # Our own MP4 segments carry full headers, no need to probe deeply
+            file_list = concat_list(valid_files, FAST_PROBE_ARGS if segment_ext == "mp4" else ())
 
             if self._abort:
-                try:
-                    if os.path.exists(file_list):
-                        os.unlink(file_list)
-                    for file in valid_files:
-                        if os.path.exists(file):
-                            os.unlink(file)
-                except:
-                    pass
+                release_segments(valid_files)
                 return "Aborted"
 
-            cmd = ["ffmpeg", "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", file_list, "-c", "copy", output_file]
-            print(f"Executing ffmpeg concat command: {' '.join(cmd)}")
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-
-            start_time = time.time()
-            while process.poll() is None:
-                if self._abort:
-                    process.terminate()
-                    try:
-                        if os.path.exists(file_list):
-                            os.unlink(file_list)
-                        if os.path.exists(output_file):
-                            os.unlink(output_file)
-                        for file in valid_files:
-                            if os.path.exists(file):
-                                os.unlink(file)
-                    except:
-                        pass
-                    return "Aborted"
-                if time.time() - start_time > 60:
-                    process.terminate()
-                    print("Concat operation timed out after 60 seconds")
-                    break
-                time.sleep(0.1)
+            # Music is mixed in while joining rather than in a second pass over the result
+            music_args = self.music_output_args()
+            cmd = ["ffmpeg", "-y", "-v", "error", *CONCAT_STDIN_ARGS]
+            full_cmd = [*cmd, *(music_args or ["-c", "copy"]), output_file]
+            print(f"Executing ffmpeg concat command: {' '.join(full_cmd)}")
+            status, returncode, stderr = self.run_process(full_cmd, 60, file_list)
+            if status == "done" and returncode != 0 and music_args:
+                # The first segment may have no audio to mix into, join without music
+                print(f"Warning: Failed to add background music: {stderr or 'No error details'}")
+                music_args = None
+                status, returncode, stderr = self.run_process(
+                    [*cmd, "-c", "copy", output_file], 60, file_list
+                )
+            if status == "aborted":
+                remove_file(output_file)
+                release_segments(valid_files)
+                return "Aborted"
+            if status == "timeout":
+                print("Concat operation timed out after 60 seconds")
 
-            stdout, stderr = process.communicate()
-            if process.returncode != 0:
-                print(f"Concat error: {stderr.strip() or 'No error details'}")
+            if returncode != 0:
+                print(f"Concat error: {stderr or 'No error details'}")
                 if valid_files:
                     output_file = valid_files[0]  # Fallback to first clip
                 else:
                     return "Error: Failed to concatenate clips"
 
-            if os.path.exists(file_list):
-                os.unlink(file_list)
-
-            # Add background music if provided
-            if os.path.exists(output_file) and os.path.getsize(output_file) > 1000:
-                if self.music_tracks or (self.music_file and os.path.exists(self.music_file)):
-                    self.progress.emit(90, "Adding background music...")
-                    temp_music_file = os.path.join(TEMP_DIR, f"temp_music_{uuid.uuid4().hex[:8]}.mp3")
-                    final_output = os.path.join(TEMP_DIR, f"preview_all_music_{uuid.uuid4().hex}.mp4")
-
-                    if self.music_tracks and len(self.music_tracks) > 0:
-                        if len(self.music_tracks) > 1:
-                            music_cmd = ["ffmpeg", "-y", "-v", "error"]
-                            music_filter = ""
-                            valid_tracks = []
-                            for track in self.music_tracks:
-                                if os.path.exists(track.file_path):
-                                    music_cmd.extend(["-i", track.file_path])
-                                    valid_tracks.append(track)
-                            if not valid_tracks:
-                                shutil.copy(output_file, final_output)
-                                output_file = final_output
-                            else:
-                                for i, track in enumerate(valid_tracks):
-                                    music_filter += f"[{i}:a]volume={track.volume}"
-                                    if track.start_time_in_track > 0 or track.duration:
-                                        music_filter += f",atrim=start={track.start_time_in_track}"
-                                        if track.duration:
-                                            music_filter += f":duration={track.duration}"
-                                    if track.start_time_in_compilation > 0:
-                                        music_filter += f",adelay={int(track.start_time_in_compilation*1000)}|{int(track.start_time_in_compilation*1000)}"
-                                    music_filter += f"[a{i}];"
-                                music_filter += "".join(f"[a{i}]" for i in range(len(valid_tracks))) + f"amix=inputs={len(valid_tracks)}:duration=longest[aout]"
-                                music_cmd.extend([
-                                    "-filter_complex", music_filter,
-                                    "-map", "[aout]",
-                                    "-c:a", "mp3", "-b:a", "192k",
-                                    temp_music_file
-                                ])
-                                music_process = subprocess.Popen(music_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                                music_process.wait(timeout=60)
-                                if not os.path.exists(temp_music_file) or os.path.getsize(temp_music_file) < 1000:
-                                    print("Failed to create mixed music file")
-                                    shutil.copy(output_file, final_output)
-                                    output_file = final_output
-                                else:
-                                    add_cmd = [
-                                        "ffmpeg", "-y", "-v", "error",
-                                        "-i", output_file, "-i", temp_music_file,
-                                        "-filter_complex", "[1:a]volume=0.7[music];[0:a][music]amix=inputs=2:duration=first[a]",
-                                        "-map", "0:v", "-map", "[a]",
-                                        "-c:v", "copy", "-c:a", "aac", "-b:a", "128k",
-                                        "-shortest", final_output
-                                    ]
-                                    add_process = subprocess.Popen(add_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                                    add_process.wait(timeout=60)
-                                    if os.path.exists(final_output) and os.path.getsize(final_output) > 1000:
-                                        try:
-                                            os.unlink(output_file)
-                                            output_file = final_output
-                                            os.unlink(temp_music_file)
-                                        except:
-                                            pass
-                                    else:
-                                        shutil.copy(output_file, final_output)
-                                        output_file = final_output
-                        else:
-                            if os.path.exists(self.music_tracks[0].file_path):
-                                add_cmd = [
-                                    "ffmpeg", "-y", "-v", "error",
-                                    "-i", output_file, "-i", self.music_tracks[0].file_path,
-                                    "-filter_complex", f"[1:a]volume={self.music_tracks[0].volume}[music];[0:a][music]amix=inputs=2:duration=first[a]",
-                                    "-map", "0:v", "-map", "[a]",
-                                    "-c:v", "copy", "-c:a", "aac", "-b:a", "128k",
-                                    "-shortest", final_output
-                                ]
-                                add_process = subprocess.Popen(add_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                                add_process.wait(timeout=60)
-                                if os.path.exists(final_output) and os.path.getsize(final_output) > 1000:
-                                    try:
-                                        os.unlink(output_file)
-                                        output_file = final_output
-                                    except:
-                                        pass
-                    elif self.music_file and os.path.exists(self.music_file):
-                        add_cmd = [
-                            "ffmpeg", "-y", "-v", "error",
-                            "-i", output_file, "-i", self.music_file,
-                            "-filter_complex", f"[1:a]volume={self.music_volume}[music];[0:a][music]amix=inputs=2:duration=first[a]",
-                            "-map", "0:v", "-map", "[a]",
-                            "-c:v", "copy", "-c:a", "aac", "-b:a", "128k",
-                            "-shortest", final_output
-                        ]
-                        add_process = subprocess.Popen(add_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                        add_process.wait(timeout=60)
-                        if os.path.exists(final_output) and os.path.getsize(final_output) > 1000:
-                            try:
-                                os.unlink(output_file)
-                                output_file = final_output
-                            except:
-                                pass
-
-                self.progress.emit(100, "Preview ready" + (" with music" if self.music_file or self.music_tracks else ""))
-                for file in valid_files:
-                    try:
-                        if os.path.exists(file) and file != output_file:
-                            os.unlink(file)
-                    except:
-                        pass
+            if file_size(output_file) > 1000:
+                self.report_progress(100, "Preview ready" + (" with music" if music_args else ""))
+                release_segments(valid_files, keep=output_file)
                 return (output_file, total_duration)
             else:
                 print("Error: Failed to create combined preview")
                 if valid_files:
                     output_file = valid_files[0]  # Fallback
-                    self.progress.emit(100, "Preview ready (fallback to single clip)")
+                    self.report_progress(100, "Preview ready (fallback to single clip)")
                     return (output_file, total_duration)
                 return "Error: Failed to create combined preview"
 
-        except Exception as e:
-            print(f"Error in process_all_clips: {str(e)}")
-            for file in valid_files:
-                try:
-                    if os.path.exists(file):
-                        os.unlink(file)
-                except:
-                    pass
-            return f"Error: {str(e)}"
+        except Exception as e:
+            print(f"Error in process_all_clips: {str(e)}")
+            release_segments(valid_files)
+            return f"Error: {str(e)}"
+
+    def export_item(self, media_item, temp_file, encoder, export_temp, stream_copy, threads=None):
+        """Encode one item of an export into temp_file, returning the path or None on failure"""
+        if self._abort:
+            return None
+
+        # Get separate video and audio effects filters if any
+        effects_filter, audio_effects = media_item.get_effects_filter_string()
+        device_args, upload_filter = hw_upload_args(encoder)
+
+        # Handle stream copy vs images vs videos
+        if stream_copy:
+            cmd = self.get_stream_copy_command(media_item, temp_file)
+
+        elif media_item.is_image:
+            # Image to video
+            cmd = [
+                "ffmpeg",
+                "-y",
+                "-v",
+                "error",
+                *device_args,
+                "-i",
+                media_item.file_path,
+                "-t",
+                str(media_item.display_duration),
+            ]
+
+            # Build filter string
+            vf = "scale=-2:720"
+
+            # Add rotation if needed
+            vf = ",".join(rotation_filters(media_item.manual_rotation) + [vf])
+
+            # Add effects if any
+            if effects_filter:
+                vf = f"{effects_filter},{vf}"
+            vf = loop_still_image(vf, effects_filter) + upload_filter
+
+            # Add filter and output options
+            cmd.extend(
+                [
+                    *video_filter_args(vf, export_temp),
+                    *video_encoder_args(encoder, "export", threads),
+                    "-flush_packets",
+                    "0",
+                    temp_file,
+                ]
+            )
+
+        else:
+            # Video clip
+            cmd = [
+                "ffmpeg",
+                "-y",
+                "-v",
+                "error",
+                *device_args,
+                "-ss",
+                str(media_item.start_time),
+                "-i",
+                media_item.file_path,
+                "-t",
+                str(
+                    (media_item.end_time or media_item.duration)
+                    - media_item.start_time
+                ),
+            ]
+
+            # Build filter string
+            vf = "scale=-2:720"
+
+            # Add rotation if needed
+            total_rotation = media_item.rotation + media_item.manual_rotation
+            vf = ",".join(rotation_filters(total_rotation) + [vf])
+
+            # Add effects if any
+            if effects_filter:
+                vf = f"{effects_filter},{vf}"
+            vf += upload_filter
+
+            # Add filter and output options
+            cmd.extend(
+                [
+                    *video_filter_args(vf, export_temp),
+                    *video_encoder_args(encoder, "export", threads),
+                    *(["-af", audio_effects] if audio_effects else []),
+                    "-c:a",
+                    "aac",
+                    "-b:a",
+                    "128k",
+                    "-flush_packets",
+                    "0",
+                    temp_file,
+                ]
+            )
+
+        if media_item.is_image:
+            duration = media_item.display_duration
+        else:
+            duration = (media_item.end_time or media_item.duration) - media_item.start_time
+        # Export encodes are slower than preview ones, so allow more time per second
+        max_processing_time = max(60, duration * 4)
+        status, returncode, stderr = self.run_process(cmd, max_processing_time)
+        if status == "timeout":
+            print(f"Processing timeout for {media_item.file_path} after {max_processing_time} seconds")
+        # A killed or failed encode can still leave a playable-looking partial file
+        if status == "done" and returncode == 0 and file_size(temp_file) > 1000:
+            return temp_file
+        if status != "aborted":
+            print(f"Error creating temp file for {os.path.basename(media_item.file_path)}: {stderr}")
+        return None
+
+    def export_single_pass(self, items, output_path, encoder):
+        """Render every item into the output with one ffmpeg filter graph
+
+        Returns "done", "aborted" or "failed"; on failure the caller falls back
+        to encoding the items one by one and joining them.
+        """
+        # Every segment of the concat filter must share one frame size, so clips
+        # are fitted into a canvas as wide as the widest of them at export height
+        width = 0
+        for media_item in items:
+            rotation = media_item.manual_rotation
+            if not media_item.is_image:
+                rotation += media_item.rotation
+            w, h = media_item.width, media_item.height
+            if rotation % 180 == 90:
+                w, h = h, w
+            if w > 0 and h > 0:
+                width = max(width, round(EXPORT_HEIGHT * w / h / 2) * 2)
+        width = width or EXPORT_HEIGHT * 16 // 9
+        fit = (
+            f"scale={width}:{EXPORT_HEIGHT}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{EXPORT_HEIGHT}:(ow-iw)/2:(oh-ih)/2,setsar=1"
+        )
+
+        # The concat output has no fixed rate, so it takes the fastest clip's
+        rates = [
+            media_item.fps for media_item in items
+            if not media_item.is_image and parse_frame_rate(media_item.fps)
+        ]
+        frame_rate = max(rates, key=parse_frame_rate, default="30")
+
+        device_args, upload_filter = hw_upload_args(encoder)
+        cmd = ["ffmpeg", "-y", "-v", "error", *device_args]
+        filters = []
+        labels = []
+        for index, media_item in enumerate(items):
+            effects_filter, audio_effects = media_item.get_effects_filter_string()
+            if media_item.is_image:
+                duration = media_item.display_duration
+                cmd.extend(["-framerate", frame_rate, "-i", media_item.file_path])
+                vf = ",".join(rotation_filters(media_item.manual_rotation) + [fit])
+                if effects_filter:
+                    vf = f"{effects_filter},{vf}"
+                vf = loop_still_image(vf, effects_filter) + f",trim=duration={duration}"
+            else:
+                duration = (media_item.end_time or media_item.duration) - media_item.start_time
+                cmd.extend([
+                    "-ss", str(media_item.start_time), "-t", str(duration),
+                    "-i", media_item.file_path,
+                ])
+                total_rotation = media_item.rotation + media_item.manual_rotation
+                vf = ",".join(rotation_filters(total_rotation) + [fit])
+                if effects_filter:
+                    vf = f"{effects_filter},{vf}"
+                # Silence for clips without sound has to last as long as the sped up video
+                for effect in media_item.effects:
+                    if effect.effect_type == "speed":
+                        duration /= effect.parameters.get("factor", 1.0) or 1.0
+                        break
+                else:
+                    duration /= media_item.playback_speed or 1.0
+            filters.append(f"[{index}:v]{vf}[v{index}]")
+            if media_item.has_audio:
+                af = f"{audio_effects}," if audio_effects else ""
+                filters.append(
+                    f"[{index}:a]{af}aresample=44100,"
+                    f"aformat=sample_fmts=fltp:channel_layouts=stereo[a{index}]"
+                )
+            else:
+                filters.append(f"anullsrc=r=44100:cl=stereo,atrim=duration={duration}[a{index}]")
+            labels.append(f"[v{index}][a{index}]")
+        # Music is mixed in the same graph rather than in a second pass over the output
+        mix = music_mix_filter(self.music_tracks, len(items), "[ca]") if self.music_tracks else None
+        audio_label = "[ca]" if mix else "[a]"
+        filters.append(f"{''.join(labels)}concat=n={len(items)}:v=1:a=1[cv]{audio_label}")
+        filters.append(f"[cv]fps={frame_rate}{upload_filter}[v]")
+        if mix:
+            cmd.extend(mix[0])
+            filters.append(mix[1])
+
+        cmd.extend([
+            "-filter_complex", ";".join(filters),
+            "-map", "[v]", "-map", "[a]",
+            *video_encoder_args(encoder, "export"),
+            "-c:a", "aac", "-b:a", "192k",
+            *EXPORT_MUX_ARGS,
+            output_path,
+        ])
+        status, returncode, stderr = self.run_process(cmd)
+        if status == "done" and returncode == 0 and file_size(output_path) > 1000:
+            return "done"
+        remove_file(output_path)
+        if status == "aborted":
+            return "aborted"
+        print(f"Warning: Single pass export failed, encoding items separately: {stderr or status}")
+        return "failed"
+
+    def finish_export(self, output_path, add_music=True):
+        """Add the background music to a finished export if it was not mixed in already"""
+        # Add music if requested and exported successfully
+        if add_music and self.music_tracks:
+            self.report_progress(85, "Adding background music...")
+            # Written next to the output so it can be renamed over it instead of
+            # copied across file systems
+            output_with_music = os.path.join(
+                os.path.dirname(os.path.abspath(output_path)), unique_name(".export_music", ".mp4")
+            )
+
+            # Mix every music track into the video's audio in one pass
+            mix = music_mix_filter(self.music_tracks)
+            if mix:
+                music_inputs, filter_complex = mix
+                cmd_parts = [
+                    "ffmpeg",
+                    "-y",
+                    "-v",
+                    "error",
+                    "-i",
+                    output_path,  # First input is the video
+                    *music_inputs,
+                    "-filter_complex",
+                    filter_complex,
+                    "-map",
+                    "0:v",
+                    "-map",
+                    "[a]",
+                    "-c:v",
+                    "copy",
+                    "-c:a",
+                    "aac",
+                    "-b:a",
+                    "192k",
+                    "-shortest",
+                    *EXPORT_MUX_ARGS,
+                    output_with_music,
+                ]
+
+                status, _, _ = self.run_process(cmd_parts)
+                if status == "aborted":
+                    remove_file(output_with_music)
+                    return "Aborted"
+
+                # Check if music addition succeeded
+                if file_size(output_with_music) > 1000:
+                    try:
+                        # Replace the output file with music version
+                        os.replace(output_with_music, output_path)
+                    except OSError as e:
+                        print(f"Error replacing output file: {str(e)}")
+                remove_file(output_with_music)
+
+        self.report_progress(100, "Export complete")
+        return output_path
 
     def export_video(self, items, output_path):
         """Export the final compilation video"""
+        export_temp = None
         try:
             if not items:
                 return "No items to process"
 
-            self.progress.emit(5, "Starting export...")
+            self.report_progress(5, "Starting export...")
 
             # Create a temporary directory for intermediate files
-            export_temp = os.path.join(TEMP_DIR, f"export_{uuid.uuid4().hex}")
+            export_temp = os.path.join(TEMP_DIR, unique_name("export"))
             os.makedirs(export_temp, exist_ok=True)
 
             # Process each item to create intermediate files
             temp_files = []
+            temp_audio = []  # Whether each temp file carries an audio stream
             total_items = len(items)
 
             # Get best available encoder for final export
-            hw_encoders = check_hw_encoders()
-            final_encoder = "libx264"  # Use software encoding for compatibility
-
-            for i, media_item in enumerate(items):
-                if self._abort:
-                    # Clean up temp files
-                    for file in temp_files:
-                        try:
-                            if os.path.exists(file):
-                                os.unlink(file)
-                        except:
-                            pass
-
-                    try:
-                        shutil.rmtree(export_temp)
-                    except:
-                        pass
-
+            final_encoder = select_video_encoder(self.use_gpu, allow_vaapi=True)
+            self.report_progress(5, f"Using {final_encoder} encoder")
+
+            # Untouched clips with matching streams can be joined without re-encoding
+            stream_copy = can_stream_copy_items(items)
+            if stream_copy:
+                self.report_progress(5, "Clips share stream parameters, skipping re-encode")
+            segment_ext = "ts" if stream_copy else "mp4"
+
+            # A single untouched clip is cut straight into the output file
+            direct_cut = stream_copy and len(items) == 1
+            # Untrimmed sources can go straight into the concat demuxer
+            direct_concat = (
+                stream_copy and not direct_cut and all(item.is_untrimmed() for item in items)
+            )
+            if direct_concat:
+                self.report_progress(10, "Clips are untrimmed, joining source files directly")
+            segment_items = [] if direct_concat or direct_cut else items
+
+            # A few re-encoded items render straight into the output, without
+            # intermediate files or a separate concat pass
+            if not stream_copy and 1 < len(items) <= EXPORT_SINGLE_PASS_ITEMS:
+                self.report_progress(10, "Rendering all clips in one pass...")
+                status = self.export_single_pass(items, output_path, final_encoder)
+                if status == "done":
+                    self.report_progress(80, "Clips rendered")
+                    return self.finish_export(output_path, add_music=False)
+                if status == "aborted":
                     return "Aborted"
 
-                # Update progress
-                self.progress.emit(
-                    int((i / total_items) * 60) + 5,
-                    f"Processing item {i+1}/{total_items}...",
+            # Items encode independently, so several ffmpeg processes share the cores
+            if segment_items:
+                workers = encoder_workers(
+                    "libx264" if stream_copy else final_encoder, len(segment_items)
                 )
-
-                # Temp file for this item
-                temp_file = os.path.join(export_temp, f"part_{i:04d}.mp4")
-
-                # Get effects filters if any
-                effects_filter = media_item.get_effects_filter_string()
-
-                # Handle images vs videos
-                if media_item.is_image:
-                    # Image to video
-                    cmd = [
-                        "ffmpeg",
-                        "-y",
-                        "-loop",
-                        "1",
-                        "-i",
-                        media_item.file_path,
-                        "-t",
-                        str(media_item.display_duration),
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(
+                            self.export_item, media_item,
+                            os.path.join(export_temp, f"part_{i:04d}.{segment_ext}"),
+                            final_encoder, export_temp, stream_copy, threads_per_encoder(workers),
+                        )
+                        for i, media_item in enumerate(segment_items)
                     ]
-
-                    # Build filter string
-                    vf = "scale=-2:720"
-
-                    # Add rotation if needed
-                    if media_item.manual_rotation != 0:
-                        rotation = f"rotate={media_item.manual_rotation*math.pi/180}"
-                        vf = f"{rotation},{vf}"
-
-                    # Add effects if any
-                    if effects_filter:
-                        vf = f"{effects_filter},{vf}"
-
-                    # Add filter and output options
-                    cmd.extend(
-                        [
-                            "-vf",
-                            vf,
-                            "-c:v",
-                            "libx264",
-                            "-preset",
-                            "medium",
-                            "-crf",
-                            "22",
-                            "-pix_fmt",
-                            "yuv420p",
-                            temp_file,
-                        ]
-                    )
-
-                else:
-                    # Video clip
-                    cmd = [
-                        "ffmpeg",
-                        "-y",
-                        "-ss",
-                        str(media_item.start_time),
-                        "-i",
-                        media_item.file_path,
-                        "-t",
-                        str(
-                            (media_item.end_time or media_item.duration)
-                            - media_item.start_time
-                        ),
+                    remaining = set(futures)
+                    while remaining:
+                        done, remaining = wait(remaining, return_when=FIRST_COMPLETED)
+                        finished = total_items - len(remaining)
+                        self.report_progress(
+                            int((finished / total_items) * 60) + 5,
+                            f"Processed item {finished}/{total_items}...",
+                        )
+                    # Collected in submission order so the concat order is kept
+                    results = [
+                        (future.result(), media_item)
+                        for future, media_item in zip(futures, segment_items)
                     ]
-
-                    # Build filter string
-                    vf = "scale=-2:720"
-
-                    # Add rotation if needed
-                    total_rotation = (
-                        media_item.rotation + media_item.manual_rotation
-                    ) % 360
-                    if total_rotation != 0:
-                        if total_rotation == 90:
-                            rotation_filter = "transpose=1"
-                        elif total_rotation == 180:
-                            rotation_filter = "transpose=2,transpose=2"
-                        elif total_rotation == 270:
-                            rotation_filter = "transpose=2"
-                        vf = f"{rotation_filter},{vf}"
-
-                    # Add effects if any
-                    if effects_filter:
-                        vf = f"{effects_filter},{vf}"
-
-                    # Add filter and output options
-                    cmd.extend(
-                        [
-                            "-vf",
-                            vf,
-                            "-c:v",
-                            "libx264",
-                            "-preset",
-                            "medium",
-                            "-crf",
-                            "22",
-                            "-c:a",
-                            "aac",
-                            "-b:a",
-                            "128k",
-                            "-pix_fmt",
-                            "yuv420p",
-                            temp_file,
-                        ]
-                    )
-
-                # Run the command
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    universal_newlines=True,
-                )
-
-                # Monitor process
-                while process.poll() is None:
-                    # Check for abort
-                    if self._abort:
-                        process.terminate()
-                        # Clean up
-                        for file in temp_files:
-                            try:
-                                if os.path.exists(file):
-                                    os.unlink(file)
-                            except:
-                                pass
-
-                        try:
-                            shutil.rmtree(export_temp)
-                        except:
-                            pass
-
-                        return "Aborted"
-
-                    # Wait a bit to avoid busy waiting
-                    time.sleep(0.1)
-
-                # Check if file was created successfully
-                if os.path.exists(temp_file) and os.path.getsize(temp_file) > 1000:
-                    temp_files.append(temp_file)
-                else:
-                    stdout, stderr = process.communicate()
-                    print(f"Error creating temp file for item {i}: {stderr}")
-                    continue  # Skip this file
-
-            # Check if we have any valid files
-            if not temp_files:
-                return "Error: No valid media files could be processed"
-
-            # Create a file list for concatenation
-            file_list = os.path.join(export_temp, "files.txt")
-            with open(file_list, "w") as f:
-                for temp_file in temp_files:
-                    fixed_path = temp_file.replace("\\", "/")
-                    f.write(f"file '{fixed_path}'\n")
-
-            # Concatenate all the files
-            self.progress.emit(70, "Combining all clips...")
-
-            # First try fast concat
-            cmd = [
-                "ffmpeg",
-                "-y",
-                "-f",
-                "concat",
-                "-safe",
-                "0",
-                "-i",
-                file_list,
-                "-c",
-                "copy",
-                output_path,
-            ]
-
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-            )
-
-            # Monitor process
-            while process.poll() is None:
-                # Check for abort
                 if self._abort:
-                    process.terminate()
-
-                    # Clean up
-                    try:
-                        if os.path.exists(output_path):
-                            os.unlink(output_path)
-                    except:
-                        pass
-
-                    for file in temp_files:
-                        try:
-                            if os.path.exists(file):
-                                os.unlink(file)
-                        except:
-                            pass
-
-                    try:
-                        shutil.rmtree(export_temp)
-                    except:
-                        pass
-
                     return "Aborted"
+                # A missing item would silently shorten the export, so fail instead
+                failed = [media_item for temp_file, media_item in results if not temp_file]
+                if failed:
+                    names = ", ".join(os.path.basename(item.file_path) for item in failed)
+                    return f"Error: Failed to process {names}"
+                temp_files = [temp_file for temp_file, _ in results]
+                # Audio presence comes from the probe done when each item was added
+                temp_audio = [media_item.has_audio for _, media_item in results]
+
+            # Source files are only read, never cleaned up like temp files
+            concat_inputs = (
+                [item.file_path for item in items] if direct_concat or direct_cut else temp_files
+            )
+            concat_audio = (
+                [item.has_audio for item in items] if direct_concat or direct_cut else temp_audio
+            )
 
-                # Wait a bit to avoid busy waiting
-                time.sleep(0.1)
-
-            # Check if concat worked
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 1000:
-                # Add music if requested and exported successfully
-                if self.music_tracks:
-                    self.progress.emit(85, "Adding background music...")
-                    output_with_music = os.path.join(
-                        export_temp, f"export_music_{uuid.uuid4().hex}.mp4"
-                    )
+            # Check if we have any valid files
+            if not concat_inputs:
+                return "Error: No valid media files could be processed"
 
-                    # Create a complex filter for multiple music tracks
-                    music_filters = ""
-                    music_mix = ""
-
-                    # Build command base
-                    cmd_parts = [
-                        "ffmpeg",
-                        "-y",
-                        "-v",
-                        "error",
-                        "-i",
-                        output_path,  # First input is the video
+            music_mix = None
+            file_list = None
+            if direct_cut:
+                # Cut the single clip from its source without re-encoding
+                self.report_progress(10, "Cutting clip without re-encoding...")
+                cmd = self.get_stream_copy_command(
+                    items[0], output_path, "mp4", EXPORT_MUX_ARGS
+                )
+            else:
+                # Create a file list for concatenation, fed to ffmpeg on stdin;
+                # our own MP4 segments need no deep probing
+                fast_probe = FAST_PROBE_ARGS if segment_ext == "mp4" and not direct_concat else ()
+                file_list = concat_list(concat_inputs, fast_probe)
+
+                # Music is mixed in while joining, instead of rewriting the joined file;
+                # the concat demuxer takes its streams from the first file
+                if self.music_tracks and concat_audio[0]:
+                    music_mix = music_mix_filter(self.music_tracks)
+                if music_mix:
+                    music_inputs, filter_complex = music_mix
+                    stream_args = [
+                        *music_inputs,
+                        "-filter_complex", filter_complex,
+                        "-map", "0:v:0", "-map", "[a]",
+                        "-c:v", "copy", "-c:a", "aac", "-b:a", "192k",
+                        "-shortest",
                     ]
+                elif direct_concat:
+                    # Sources may carry extra data tracks the segments don't
+                    stream_args = ["-map", "0:v:0", "-map", "0:a:0?", "-c", "copy"]
+                else:
+                    stream_args = ["-c", "copy"]
 
-                    # Add input for each music track
-                    track_ids = []
-                    for i, track in enumerate(self.music_tracks):
-                        if not os.path.exists(track.file_path):
-                            continue
-
-                        # Add input for this track
-                        cmd_parts.extend(["-i", track.file_path])
-                        input_idx = i + 1  # Input index in ffmpeg (0 is video)
-                        track_id = f"m{i}"
-                        track_ids.append(track_id)
-
-                        # Add volume and trim filter
-                        music_filters += f"[{input_idx}:a]volume={track.volume}"
-
-                        # Add trim if needed
-                        if track.start_time_in_track > 0 or track.duration:
-                            music_filters += f",atrim=start={track.start_time_in_track}"
-                            if track.duration:
-                                music_filters += f":duration={track.duration}"
-
-                        # Add delay if needed (for start time in compilation)
-                        if track.start_time_in_compilation > 0:
-                            music_filters += f",adelay={int(track.start_time_in_compilation*1000)}|{int(track.start_time_in_compilation*1000)}"
-
-                        # Name the output
-                        music_filters += f"[{track_id}];"
-
-                    # Combine all music tracks if there are multiple
-                    if len(track_ids) > 1:
-                        music_mix = (
-                            "".join([f"[{tid}]" for tid in track_ids])
-                            + f"amix=inputs={len(track_ids)}:duration=longest[music];"
-                        )
-                    elif len(track_ids) == 1:
-                        music_mix = f"[{track_ids[0]}]aformat=sample_fmts=fltp[music];"
-
-                    # Combine with original audio if we have music
-                    if music_mix:
-                        filter_complex = f"{music_filters}{music_mix}[0:a][music]amix=inputs=2:duration=first[a]"
-
-                        # Complete command
-                        cmd_parts.extend(
-                            [
-                                "-filter_complex",
-                                filter_complex,
-                                "-map",
-                                "0:v",
-                                "-map",
-                                "[a]",
-                                "-c:v",
-                                "copy",
-                                "-c:a",
-                                "aac",
-                                "-b:a",
-                                "192k",
-                                "-shortest",
-                                output_with_music,
-                            ]
-                        )
+                # Concatenate all the files
+                self.report_progress(
+                    70, "Combining all clips and adding music..." if music_mix else "Combining all clips..."
+                )
 
-                        process = subprocess.Popen(
-                            cmd_parts,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            text=True,
-                        )
+                cmd = [
+                    "ffmpeg",
+                    "-y",
+                    "-v",
+                    "error",
+                    *CONCAT_STDIN_ARGS,
+                    *stream_args,
+                    *EXPORT_MUX_ARGS,
+                    output_path,
+                ]
 
-                        # Monitor with timeout
-                        start_time = time.time()
-                        while process.poll() is None:
-                            if self._abort:
-                                process.terminate()
-                                try:
-                                    if os.path.exists(output_with_music):
-                                        os.unlink(output_with_music)
-                                except:
-                                    pass
-                                return "Aborted"
-
-                            # Wait a bit
-                            time.sleep(0.1)
-
-                        # Check if music addition succeeded
-                        if (
-                            os.path.exists(output_with_music)
-                            and os.path.getsize(output_with_music) > 1000
-                        ):
-                            try:
-                                # Replace the output file with music version
-                                os.unlink(output_path)
-                                shutil.move(output_with_music, output_path)
-                            except Exception as e:
-                                print(f"Error replacing output file: {str(e)}")
-
-                # Clean up
-                try:
-                    shutil.rmtree(export_temp)
-                except:
-                    pass
+            status, returncode, stderr = self.run_process(cmd, input=file_list)
+            if status == "aborted":
+                remove_file(output_path)
+                return "Aborted"
 
-                self.progress.emit(100, "Export complete")
-                return output_path
+            # Check if concat worked
+            if returncode == 0 and file_size(output_path) > 1000:
+                return self.finish_export(output_path, add_music=music_mix is None)
 
-            # If concat failed, try re-encoding
-            self.progress.emit(80, "Using alternate export method...")
+            # If concat failed, drop whatever it wrote and try re-encoding
+            print(f"Warning: Joining clips failed, re-encoding: {stderr}")
+            remove_file(output_path)
+            self.report_progress(80, "Using alternate export method...")
 
             # Create combined filter
             filter_complex = ""
+            device_args, upload_filter = hw_upload_args(final_encoder)
 
-            if len(temp_files) == 1:
+            if len(concat_inputs) == 1:
                 # Just one file, copy it with re-encoding
+                trim_args = []
+                if direct_cut:
+                    # The input is the untrimmed source file
+                    trim_args = [
+                        "-ss", str(items[0].start_time),
+                        "-t", str((items[0].end_time or items[0].duration) - items[0].start_time),
+                    ]
                 cmd = [
                     "ffmpeg",
                     "-y",
+                    "-v",
+                    "error",
+                    *device_args,
+                    *trim_args,
                     "-i",
-                    temp_files[0],
-                    "-c:v",
-                    "libx264",
-                    "-preset",
-                    "medium",
-                    "-crf",
-                    "22",
+                    concat_inputs[0],
+                    "-vf",
+                    upload_filter.lstrip(","),
+                    *video_encoder_args(final_encoder, "export"),
                     "-c:a",
                     "aac",
                     "-b:a",
                     "192k",
-                    "-pix_fmt",
-                    "yuv420p",
+                    *EXPORT_MUX_ARGS,
                     output_path,
                 ]
             else:
                 # Multiple files
                 inputs = []
-                for temp_file in temp_files:
+                for temp_file in concat_inputs:
                     inputs.extend(["-i", temp_file])
 
                 # Create filter complex for concat
-                for i in range(len(temp_files)):
+                for i in range(len(concat_inputs)):
                     filter_complex += f"[{i}:v]"
-                filter_complex += f"concat=n={len(temp_files)}:v=1:a=0[outv];"
+                filter_complex += f"concat=n={len(concat_inputs)}:v=1:a=0[outv];"
 
-                # Add audio if available (from first file)
+                # Add audio if available (from first file that has any)
                 audio_option = []
-                for i, temp_file in enumerate(temp_files):
-                    try:
-                        audio_info = subprocess.run(
-                            [
-                                "ffprobe",
-                                "-v",
-                                "error",
-                                "-select_streams",
-                                "a",
-                                "-show_streams",
-                                "-of",
-                                "json",
-                                temp_file,
-                            ],
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            text=True,
-                        )
-                        if '"codec_type":"audio"' in audio_info.stdout:
-                            filter_complex += f"[{i}:a]aresample=44100[a{i}];"
-                            audio_option.extend(["-map", f"[a{i}]"])
-                            break
-                    except:
-                        pass
+                for i, has_audio in enumerate(concat_audio):
+                    if has_audio:
+                        filter_complex += f"[{i}:a]aresample=44100[a{i}];"
+                        audio_option.extend(["-map", f"[a{i}]"])
+                        break
 
                 # Add video map
-                filter_complex += f"[outv]scale=-2:720[outv2]"
+                filter_complex += f"[outv]scale=-2:720{upload_filter}[outv2]"
 
                 # Build final command
                 cmd = (
-                    ["ffmpeg", "-y"]
+                    ["ffmpeg", "-y", "-v", "error", *device_args]
                     + inputs
                     + ["-filter_complex", filter_complex, "-map", "[outv2]"]
                     + audio_option
+                    + video_encoder_args(final_encoder, "export")
                     + [
-                        "-c:v",
-                        "libx264",
-                        "-preset",
-                        "medium",
-                        "-crf",
-                        "22",
                         "-c:a",
                         "aac",
                         "-b:a",
                         "192k",
-                        "-pix_fmt",
-                        "yuv420p",
+                        *EXPORT_MUX_ARGS,
                         output_path,
                     ]
                 )
 
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-            )
-
-            # Monitor process
-            while process.poll() is None:
-                # Check for abort
-                if self._abort:
-                    process.terminate()
-
-                    # Clean up
-                    try:
-                        if os.path.exists(output_path):
-                            os.unlink(output_path)
-                    except:
-                        pass
-
-                    for file in temp_files:
-                        try:
-                            if os.path.exists(file):
-                                os.unlink(file)
-                        except:
-                            pass
-
-                    try:
-                        shutil.rmtree(export_temp)
-                    except:
-                        pass
-
-                    return "Aborted"
-
-                # Sleep a bit to avoid busy waiting
-                time.sleep(0.1)
-
-            # Clean up
-            try:
-                shutil.rmtree(export_temp)
-            except:
-                pass
+            status, returncode, stderr = self.run_process(cmd)
+            if status == "aborted":
+                remove_file(output_path)
+                return "Aborted"
 
             # Final check
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 1000:
-                self.progress.emit(100, "Export complete")
+            if returncode == 0 and file_size(output_path) > 1000:
+                self.report_progress(100, "Export complete")
                 return output_path
             else:
-                stdout, stderr = process.communicate()
                 print(f"Export failed: {stderr}")
+                remove_file(output_path)
                 return "Error: Failed to create output file"
 
         except Exception as e:
             print(f"Export error: {str(e)}")
             return f"Error: {str(e)}"
+        finally:
+            # Intermediate files all live in the export's temp directory
+            if export_temp:
+                shutil.rmtree(export_temp, ignore_errors=True)
 
 
 class ProcessingThread(QThread):
@@ -1777,14 +2882,15 @@ class ProcessingThread(QThread):
     progress = pyqtSignal(int, str)
     finished = pyqtSignal(str, object)  # task, result
     error = pyqtSignal(str, str)  # task, error message
+    preview_started = pyqtSignal(str)  # path of a preview still being written
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        # The worker is called straight from run(), so it stays a plain object
+        # and its signals are re-emitted in place; only the hop to the UI is queued
         self.worker = ProcessingWorker()
-        self.worker.moveToThread(self)
-        self.worker.progress.connect(self.progress)
-        self.worker.finished.connect(self.on_worker_finished)
-        self.worker.error.connect(self.on_worker_error)
+        self.worker.progress.connect(self.progress, Qt.DirectConnection)
+        self.worker.preview_started.connect(self.preview_started, Qt.DirectConnection)
 
         self.task = None
         self.args = None
@@ -1793,26 +2899,17 @@ class ProcessingThread(QThread):
         try:
             if self.task == "preview_item":
                 result = self.worker.create_preview(self.args[0])
-                self.on_worker_finished(self.task, result)
             elif self.task == "preview_all":
                 result = self.worker.process_all_clips(self.args[0])
-                self.on_worker_finished(self.task, result)
             elif self.task == "export":
                 result = self.worker.export_video(self.args[0], self.args[1])
-                self.on_worker_finished(self.task, result)
             else:
                 self.error.emit(self.task, "Unknown task")
+                return
+            self.finished.emit(self.task, result)
         except Exception as e:
             self.error.emit(self.task, str(e))
 
-    def on_worker_finished(self, task, result):
-        """Handle worker completion"""
-        self.finished.emit(self.task, result)
-
-    def on_worker_error(self, task, error):
-        """Handle worker error"""
-        self.error.emit(self.task, error)
-
     def setup_task(self, task, args):
         """Set up the task to be run"""
         self.task = task
@@ -1823,9 +2920,26 @@ class ProcessingThread(QThread):
         self.worker.abort()
 
 
+@lru_cache(maxsize=4096)
+def _format_whole_seconds(seconds):
+    """mm:ss.ms label for a whole number of seconds, as drawn on timeline markers"""
+    return f"{seconds // 60}:{seconds % 60:02d}.00"
+
+
 class TimelineWidget(QWidget):
     """Interactive widget to display the timeline of clips with drag and zoom support"""
     clip_selected = pyqtSignal(int)  # Emits the index of the selected clip
+    CURSOR_LABEL_WIDTH = 80  # Position label box centred on the cursor line
+    CURSOR_LABEL_HEIGHT = 20
+    MARKER_PEN = QPen(QColor(100, 100, 100), 1, Qt.DotLine)
+    MARKER_LABEL_COLOR = QColor(150, 150, 150)
+    IMAGE_COLOR = QColor(60, 179, 113)  # Green for images
+    VIDEO_COLOR = QColor(65, 105, 225)  # Blue for videos
+    HIGHLIGHT_COLOR = QColor(255, 165, 0)  # Orange for pending changes and hover
+    BORDER_PEN = QPen(QColor(200, 200, 200), 1)
+    TEXT_COLOR = QColor(255, 255, 255)
+    HOVER_PEN = QPen(QColor(255, 165, 0), 2)
+    HOVER_LABEL_BACKGROUND = QColor(0, 0, 0, 180)
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -1845,6 +2959,13 @@ class TimelineWidget(QWidget):
         self.hover_x = -1
         self.music_tracks = []  # List of music tracks to display
         self.has_pending_changes = False  # Flag to indicate unsaved changes
+        self._layout = None  # (pixels per second, clip indices, start x, widths), see clip_layout
+        self._elided_names = {}  # Clip index -> name elided to fit, valid for the current layout
+        # Repaints asked for by input and playback are batched to about 60 per second
+        self._repaint_timer = QTimer(self)
+        self._repaint_timer.setSingleShot(True)
+        self._repaint_timer.setInterval(16)
+        self._repaint_timer.timeout.connect(self.update)
 
         # Set mouse tracking to handle hover effects
         self.setMouseTracking(True)
@@ -1854,6 +2975,10 @@ class TimelineWidget(QWidget):
 
     def set_position(self, position):
         """Set the current playback position in seconds"""
+        pixels_per_second = self.pixels_per_second * self.zoom_level
+        scroll = self.scroll_offset
+        old_position = self.current_position
+        old_x = int(old_position * pixels_per_second) - int(scroll)
         self.current_position = position
 
         # Auto-scroll to keep playback position visible
@@ -1871,12 +2996,30 @@ class TimelineWidget(QWidget):
                     0, position * pixels_per_second - widget_width / 2
                 )
 
-        self.update()
+        if self.scroll_offset != scroll:
+            self.schedule_update()
+            return
+
+        # Only the old and new cursor columns (line plus centred label) change;
+        # zoomed out, the label's hundredths change while the line stays put
+        new_x = int(position * pixels_per_second) - int(scroll)
+        half = self.CURSOR_LABEL_WIDTH // 2 + 1  # Covers the 2px line too
+        if new_x != old_x:
+            self.update(old_x - half, 0, 2 * half, self.height())
+            self.update(new_x - half, 0, 2 * half, self.height())
+        elif self.format_time(position) != self.format_time(old_position):
+            self.update(new_x - half, 2, 2 * half, self.CURSOR_LABEL_HEIGHT)
+
+    def schedule_update(self):
+        """Repaint soon, folding any further requests until then into the same paint"""
+        if not self._repaint_timer.isActive():
+            self._repaint_timer.start()
 
     def set_clips(self, clips):
         """Set the clips to display"""
         self.clips = clips
         self.total_duration = sum(clip.get("duration", 0) for clip in clips)
+        self._layout = None
 
         # Adjust zoom level to fit all clips if needed
         if self.total_duration > 0 and self.width() > 0:
@@ -1886,17 +3029,17 @@ class TimelineWidget(QWidget):
             if self.zoom_level < min_zoom:
                 self.zoom_level = min_zoom
 
-        self.update()
+        self.schedule_update()
 
     def set_music_tracks(self, tracks):
         """Set music tracks to display in timeline"""
         self.music_tracks = tracks
-        self.update()
+        self.schedule_update()
 
     def set_pending_changes(self, has_changes):
         """Set whether there are pending changes"""
         self.has_pending_changes = has_changes
-        self.update()
+        self.schedule_update()
 
     def timeline_width(self):
         """Calculate the total width of the timeline in pixels based on zoom"""
@@ -1905,6 +3048,12 @@ class TimelineWidget(QWidget):
             int(self.total_duration * self.pixels_per_second * self.zoom_level),
         )
 
+    def set_scroll_offset(self, offset):
+        """Scroll to offset pixels, kept within the timeline, and repaint"""
+        max_offset = max(0, self.timeline_width() - self.width())
+        self.scroll_offset = max(0, min(offset, max_offset))
+        self.schedule_update()
+
     def seconds_to_pixels(self, seconds):
         """Convert a time in seconds to pixels based on current zoom"""
         return seconds * self.pixels_per_second * self.zoom_level
@@ -1915,6 +3064,35 @@ class TimelineWidget(QWidget):
             return 0
         return pixels / (self.pixels_per_second * self.zoom_level)
 
+    def clip_layout(self):
+        """Get the drawn clips as (indices, start x, widths) in timeline pixels
+
+        Rebuilt only when the clips or the zoom change, so painting and hit
+        testing can bisect into it instead of walking every clip.
+        """
+        pixels_per_second = self.pixels_per_second * self.zoom_level
+        if self._layout is None or self._layout[0] != pixels_per_second:
+            indices, starts, widths = [], [], []
+            x = 0
+            for i, clip in enumerate(self.clips):
+                clip_duration = clip.get("duration", 0)
+                if clip_duration <= 0:
+                    continue
+                clip_width = max(int(clip_duration * pixels_per_second), 2)
+                indices.append(i)
+                starts.append(x)
+                widths.append(clip_width)
+                x += clip_width
+            self._layout = (pixels_per_second, indices, starts, widths)
+            self._elided_names.clear()
+        return self._layout[1:]
+
+    def changeEvent(self, event):
+        """Re-elide clip names when the font changes"""
+        if event.type() == QEvent.FontChange:
+            self._elided_names.clear()
+        super().changeEvent(event)
+
     def mousePressEvent(self, event):
         """Handle mouse press events for dragging"""
         if event.button() == Qt.LeftButton:
@@ -1936,20 +3114,15 @@ class TimelineWidget(QWidget):
         if self.dragging:
             # Calculate drag distance
             delta_x = event.x() - self.drag_start_x
-            new_offset = max(0, self.drag_start_offset - delta_x)
-
-            # Limit scrolling to timeline width
-            max_offset = max(0, self.timeline_width() - self.width())
-            self.scroll_offset = min(new_offset, max_offset)
-
-            self.update()
+            self.set_scroll_offset(self.drag_start_offset - delta_x)
         else:
             # For hover effects, determine which clip is under the cursor
+            hover_clip_index = self.get_clip_at_position(int(event.x() + self.scroll_offset))
+            # The hover line follows the cursor only while it is over a clip
+            if hover_clip_index != -1 or hover_clip_index != self.hover_clip_index:
+                self.schedule_update()
             self.hover_x = event.x()
-            self.hover_clip_index = self.get_clip_at_position(
-                int(event.x() + self.scroll_offset)
-            )
-            self.update()
+            self.hover_clip_index = hover_clip_index
 
         super().mouseMoveEvent(event)
 
@@ -1967,22 +3140,13 @@ class TimelineWidget(QWidget):
 
             # Calculate new position after zoom
             new_cursor_x = self.seconds_to_pixels(cursor_time)
-            self.scroll_offset = max(0, new_cursor_x - event.x())
-
-            # Limit scrolling to timeline width
-            max_offset = max(0, self.timeline_width() - self.width())
-            self.scroll_offset = min(self.scroll_offset, max_offset)
+            self.set_scroll_offset(new_cursor_x - event.x())
         else:
             # Horizontal scrolling
             delta = event.angleDelta().y()
             scroll_delta = 100 if delta < 0 else -100
-            new_offset = max(0, self.scroll_offset + scroll_delta)
+            self.set_scroll_offset(self.scroll_offset + scroll_delta)
 
-            # Limit scrolling to timeline width
-            max_offset = max(0, self.timeline_width() - self.width())
-            self.scroll_offset = min(new_offset, max_offset)
-
-        self.update()
         event.accept()
 
     def mouseDoubleClickEvent(self, event):
@@ -1998,24 +3162,16 @@ class TimelineWidget(QWidget):
         if not self.clips:
             return -1
 
-        pixels_per_second = self.pixels_per_second * self.zoom_level
-        x = 0
-
-        for i, clip in enumerate(self.clips):
-            clip_duration = clip.get("duration", 0)
-            if clip_duration <= 0:
-                continue
-
-            clip_width = int(clip_duration * pixels_per_second)
-            if x <= pixel_x < x + clip_width:
-                return i
-
-            x += clip_width
-
+        indices, starts, widths = self.clip_layout()
+        k = bisect.bisect_right(starts, pixel_x) - 1
+        if k >= 0 and pixel_x < starts[k] + widths[k]:
+            return indices[k]
         return -1
 
     def format_time(self, seconds):
         """Format time in seconds to mm:ss.ms"""
+        if seconds == int(seconds):
+            return _format_whole_seconds(int(seconds))
         minutes = int(seconds // 60)
         seconds_remainder = seconds % 60
         return f"{minutes}:{int(seconds_remainder):02d}.{int((seconds_remainder * 100) % 100):02d}"
@@ -2027,14 +3183,18 @@ class TimelineWidget(QWidget):
         width = self.width()
         height = self.height()
 
+        # Only the exposed strip needs repainting; Qt clips everything else
+        dirty = event.rect()
+        left, right = dirty.left(), dirty.right()
+
         # Draw background
-        painter.fillRect(0, 0, width, height, QColor(30, 30, 30))
+        painter.fillRect(dirty, QColor(30, 30, 30))
 
         # Calculate pixels per second based on zoom
         pixels_per_second = self.pixels_per_second * self.zoom_level
 
         # Draw time markers and grid
-        self.draw_time_markers(painter, width, height, pixels_per_second)
+        self.draw_time_markers(painter, width, height, pixels_per_second, left, right)
 
         # Draw clips
         if not self.clips or self.total_duration <= 0:
@@ -2049,113 +3209,103 @@ class TimelineWidget(QWidget):
 
         main_clip_height = height - music_height - 5 if music_height > 0 else height
 
-        # Draw clips with offset for scrolling
-        x = -int(self.scroll_offset)
-        for i, clip in enumerate(self.clips):
-            clip_duration = clip.get("duration", 0)
-            if clip_duration <= 0:
-                continue
-
-            # Calculate width based on duration
-            clip_width = max(int(clip_duration * pixels_per_second), 2)
-
-            # Skip clips outside the view
-            if x + clip_width < 0 or x > width:
-                x += clip_width
-                continue
-
-            # Determine if this clip is being hovered
-            is_hover = i == self.hover_clip_index
-
-            # Draw clip
-            is_image = clip.get("is_image", False)
-            has_changes = clip.get("has_pending_changes", False)
-            clip_rect = QRect(x, 5, clip_width, int(main_clip_height - 10))
-
-            # Clip background
-            if is_image:
-                base_color = QColor(60, 179, 113)  # Green for images
-            else:
-                base_color = QColor(65, 105, 225)  # Blue for videos
-
-            # Adjust color for hover state
-            if is_hover:
+        font = painter.font()
+        font.setBold(True)
+        painter.setFont(font)
+        font_metrics = painter.fontMetrics()
+
+        # Collect the clips inside the exposed strip, offset for scrolling
+        indices, starts, widths = self.clip_layout()
+        scroll = int(self.scroll_offset)
+        clip_height = int(main_clip_height - 10)
+        visible = []
+        first = max(0, bisect.bisect_right(starts, scroll + left) - 1)
+        for k in range(first, len(indices)):
+            x = starts[k] - scroll
+            if x > right:
+                break
+            i = indices[k]
+            visible.append((i, self.clips[i], QRect(x, 5, widths[k], clip_height)))
+
+        # Draw in passes so each pen is set once per paint rather than per clip:
+        # backgrounds (lighter while hovered), pending markers, borders, text
+        for i, clip, clip_rect in visible:
+            base_color = self.IMAGE_COLOR if clip.get("is_image", False) else self.VIDEO_COLOR
+            if i == self.hover_clip_index:
                 base_color = base_color.lighter(130)
-
             painter.fillRect(clip_rect, base_color)
 
-            # Draw pending changes indicator if needed
-            if has_changes:
-                indicator_rect = QRect(x + 5, 10, 10, 10)
-                painter.setPen(Qt.NoPen)
-                painter.setBrush(QColor(255, 165, 0))  # Orange for pending changes
-                painter.drawEllipse(indicator_rect)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.HIGHLIGHT_COLOR)
+        for i, clip, clip_rect in visible:
+            if clip.get("has_pending_changes", False):
+                painter.drawEllipse(QRect(clip_rect.x() + 5, 10, 10, 10))
+        painter.setBrush(Qt.NoBrush)
 
-            # Draw border
-            border_color = QColor(200, 200, 200)
-            painter.setPen(QPen(border_color, 1))
+        painter.setPen(self.BORDER_PEN)
+        for i, clip, clip_rect in visible:
             painter.drawRect(clip_rect)
 
-            # Draw clip number
-            painter.setPen(QColor(255, 255, 255))
+        painter.setPen(self.TEXT_COLOR)
+        for i, clip, clip_rect in visible:
+            x = clip_rect.x()
+            clip_width = clip_rect.width()
             painter.drawText(x + 5, 20, f"{i+1}")
 
             # Draw clip name (truncated if needed)
-            clip_name = clip.get("name", "")
-            name_rect = QRect(
-                x + 5, int(main_clip_height) // 2 - 10, clip_width - 10, 20
-            )
-            font = painter.font()
-            font.setBold(True)
-            painter.setFont(font)
-
             if clip_width > 60:  # Only draw name if clip is wide enough
-                name = painter.fontMetrics().elidedText(
-                    clip_name, Qt.ElideMiddle, clip_width - 10
+                name_rect = QRect(
+                    x + 5, int(main_clip_height) // 2 - 10, clip_width - 10, 20
                 )
+                name = self._elided_names.get(i)
+                if name is None:
+                    name = font_metrics.elidedText(
+                        clip.get("name", ""), Qt.ElideMiddle, clip_width - 10
+                    )
+                    self._elided_names[i] = name
                 painter.drawText(name_rect, Qt.AlignCenter, name)
 
             # Draw duration
-            duration_text = self.format_time(clip_duration)
-            painter.setPen(QColor(255, 255, 255))
+            duration_text = self.format_time(clip.get("duration", 0))
             painter.drawText(x + 5, int(main_clip_height - 10), duration_text)
 
-            # Draw hover information if this clip is being hovered
-            if is_hover and clip_width > 20:
-                hover_pos = self.hover_x - x
-                hover_time = self.pixels_to_seconds(hover_pos)
-                if 0 <= hover_time <= clip_duration:
-                    # Calculate the position within this clip
-                    clip_start_time = clip.get("start_time", 0)
-                    absolute_time = clip_start_time + hover_time
-
-                    # Draw time indicator
-                    painter.setPen(QPen(QColor(255, 165, 0), 2))  # Orange line
-                    hover_x_pos = int(x + hover_pos)
-                    painter.drawLine(
-                        hover_x_pos, 5, hover_x_pos, int(main_clip_height - 5)
-                    )
-
-                    # Draw time label
-                    time_label = f"{self.format_time(absolute_time)}"
-                    painter.fillRect(
-                        hover_x_pos - 40,
-                        int(main_clip_height - 30),
-                        80,
-                        20,
-                        QColor(0, 0, 0, 180),
-                    )
-                    painter.setPen(QColor(255, 165, 0))
-                    painter.drawText(
-                        hover_x_pos - 40,
-                        int(main_clip_height - 30),
-                        80,
-                        20,
-                        Qt.AlignCenter,
-                        time_label,
-                    )
+        # Draw hover information for the hovered clip
+        for i, clip, clip_rect in visible:
+            if i != self.hover_clip_index or clip_rect.width() <= 20:
+                continue
+            x = clip_rect.x()
+            hover_pos = self.hover_x - x
+            hover_time = self.pixels_to_seconds(hover_pos)
+            if 0 <= hover_time <= clip.get("duration", 0):
+                # Calculate the position within this clip
+                clip_start_time = clip.get("start_time", 0)
+                absolute_time = clip_start_time + hover_time
+
+                # Draw time indicator
+                painter.setPen(self.HOVER_PEN)
+                hover_x_pos = int(x + hover_pos)
+                painter.drawLine(
+                    hover_x_pos, 5, hover_x_pos, int(main_clip_height - 5)
+                )
 
-            x += clip_width
+                # Draw time label
+                time_label = f"{self.format_time(absolute_time)}"
+                painter.fillRect(
+                    hover_x_pos - 40,
+                    int(main_clip_height - 30),
+                    80,
+                    20,
+                    self.HOVER_LABEL_BACKGROUND,
+                )
+                painter.setPen(self.HIGHLIGHT_COLOR)
+                painter.drawText(
+                    hover_x_pos - 40,
+                    int(main_clip_height - 30),
+                    80,
+                    20,
+                    Qt.AlignCenter,
+                    time_label,
+                )
 
         # Draw music tracks if any
         if self.music_tracks and music_height > 0:
@@ -2186,7 +3336,7 @@ class TimelineWidget(QWidget):
                 end_px = start_px + self.seconds_to_pixels(duration)
 
                 # Draw track if visible
-                if end_px >= 0 and start_px < width:
+                if end_px >= max(0, left) and start_px <= min(width, right):
                     # Draw track background
                     track_rect = QRect(
                         int(max(0, start_px)),
@@ -2229,9 +3379,10 @@ class TimelineWidget(QWidget):
                 position_text = self.format_time(self.current_position)
 
                 # Position text background
-                text_width = 80
+                text_width = self.CURSOR_LABEL_WIDTH
                 painter.fillRect(
-                    pos_x - text_width // 2, 2, text_width, 20, QColor(0, 0, 0, 180)
+                    pos_x - text_width // 2, 2, text_width, self.CURSOR_LABEL_HEIGHT,
+                    QColor(0, 0, 0, 180),
                 )
 
                 painter.setPen(QColor(255, 0, 0))
@@ -2239,7 +3390,7 @@ class TimelineWidget(QWidget):
                     pos_x - text_width // 2,
                     2,
                     text_width,
-                    20,
+                    self.CURSOR_LABEL_HEIGHT,
                     Qt.AlignCenter,
                     position_text,
                 )
@@ -2255,8 +3406,10 @@ class TimelineWidget(QWidget):
         painter.setPen(QColor(200, 200, 200))
         painter.drawText(width - 100, 20, zoom_text)
 
-    def draw_time_markers(self, painter, width, height, pixels_per_second):
-        """Draw time markers and grid lines"""
+    def draw_time_markers(
+        self, painter, width, height, pixels_per_second, left=0, right=None
+    ):
+        """Draw time markers and grid lines between x positions left and right"""
         # Determine appropriate interval for time markers based on zoom
         if pixels_per_second > 200:
             # Very zoomed in - show 1 second intervals
@@ -2274,32 +3427,40 @@ class TimelineWidget(QWidget):
             # Very zoomed out - show minute intervals
             interval = 60
 
-        # Calculate visible time range
-        start_time = max(0, self.pixels_to_seconds(self.scroll_offset))
-        end_time = self.pixels_to_seconds(self.scroll_offset + width)
+        # Calculate visible time range; labels run right of their line, so
+        # start a little before the exposed strip
+        if right is None:
+            right = width
+        start_time = max(0, self.pixels_to_seconds(self.scroll_offset + left - 70))
+        end_time = self.pixels_to_seconds(self.scroll_offset + right)
 
         # Round start time down to nearest interval
         start_time = (start_time // interval) * interval
 
-        # Draw markers
-        painter.setPen(QPen(QColor(100, 100, 100), 1, Qt.DotLine))
-
-        for t in range(int(start_time), int(end_time) + interval, interval):
-            x = int(t * pixels_per_second) - int(self.scroll_offset)
-
-            # Draw vertical line
-            painter.drawLine(x, 0, x, height)
+        # Draw all grid lines in one call, then their labels with one pen
+        times = range(int(start_time), int(end_time) + interval, interval)
+        scroll = int(self.scroll_offset)
+        xs = [int(t * pixels_per_second) - scroll for t in times]
+        painter.setPen(self.MARKER_PEN)
+        painter.drawLines([QLine(x, 0, x, height) for x in xs])
 
-            # Draw time label
-            time_str = self.format_time(t)
-            painter.setPen(QColor(150, 150, 150))
-            painter.drawText(x + 2, height - 2, time_str)
-            painter.setPen(QPen(QColor(100, 100, 100), 1, Qt.DotLine))
+        painter.setPen(self.MARKER_LABEL_COLOR)
+        for t, x in zip(times, xs):
+            painter.drawText(x + 2, height - 2, _format_whole_seconds(t))
 
 
 class VideoEffect:
     """Class representing a video effect to be applied to a media item"""
 
+    # Visual filters whose ffmpeg string doesn't depend on any parameter
+    STATIC_FILTERS = {
+        "grayscale": "hue=s=0",
+        "sepia": "colorchannelmixer=.393:.769:.189:0:.349:.686:.168:0:.272:.534:.131",
+        "vignette": "vignette=PI/4",
+        "sharpen": "unsharp=5:5:1.5:5:5:0.0",
+        "noise": "noise=alls=20:allf=t",
+    }
+
     def __init__(self, effect_type="none", parameters=None):
         self.effect_type = effect_type  # Type of effect (speed, filter, etc.)
         self.parameters = parameters or {}  # Parameters specific to the effect
@@ -2335,19 +3496,12 @@ class VideoEffect:
         elif self.effect_type == "filter":
             # Visual filter (video only)
             filter_name = self.parameters.get("name", "")
-            if filter_name == "grayscale":
-                return ("hue=s=0", "")
-            elif filter_name == "sepia":
-                return ("colorchannelmixer=.393:.769:.189:0:.349:.686:.168:0:.272:.534:.131", "")
-            elif filter_name == "vignette":
-                return ("vignette=PI/4", "")
-            elif filter_name == "blur":
+            static = self.STATIC_FILTERS.get(filter_name)
+            if static:
+                return (static, "")
+            if filter_name == "blur":
                 blur_amount = self.parameters.get("amount", 5)
                 return (f"boxblur={blur_amount}:1", "")
-            elif filter_name == "sharpen":
-                return ("unsharp=5:5:1.5:5:5:0.0", "")
-            elif filter_name == "noise":
-                return ("noise=alls=20:allf=t", "")
             elif filter_name == "contrast":
                 contrast = self.parameters.get("amount", 1.5)
                 return (f"eq=contrast={contrast}", "")
@@ -2504,8 +3658,8 @@ class EffectsDialog(QDialog):
         # Create the effect
         effect = VideoEffect("filter", parameters)
 
-        # Add the new effect
-        self.media_item.effects.append(effect)
+        # Add the new effect; assigning a new list drops the item's cached filters
+        self.media_item.effects = [*self.media_item.effects, effect]
 
         # Mark item as having pending changes
         self.media_item.has_pending_changes = True
@@ -2527,7 +3681,9 @@ class EffectsDialog(QDialog):
                 effect.effect_type == "filter"
                 and effect.parameters.get("name", "") == filter_name
             ):
-                self.media_item.effects.pop(i)
+                self.media_item.effects = (
+                    self.media_item.effects[:i] + self.media_item.effects[i + 1:]
+                )
                 # Mark item as having pending changes
                 self.media_item.has_pending_changes = True
                 break
@@ -2572,23 +3728,10 @@ class MusicTrack:
         self.volume = volume  # Volume level (0.0 to 1.0)
         self.track_id = str(uuid.uuid4())[:8]  # Unique ID for this track
 
-        # Get total duration of the music file
+        # Get total duration of the music file; probe_media caches it, so the
+        # tracks rebuilt from music_file on every export don't rerun ffprobe
         try:
-            cmd = [
-                "ffprobe",
-                "-v",
-                "error",
-                "-print_format",
-                "json",
-                "-show_format",
-                self.file_path,
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                raise ValueError(f"ffprobe failed: {result.stderr}")
-
-            probe = json.loads(result.stdout)
+            probe = probe_media(self.file_path)
             self.total_duration = float(probe["format"]["duration"])
 
             # If duration is None, use the full track length
@@ -2949,7 +4092,9 @@ class VideoCompilationEditor(QMainWindow):
     def __init__(self):
         super().__init__()
         # Clean up temp files on startup
-        cleanup_temp_dirs()
+        cleanup_temp_dirs_in_background()
+        # Find a working hardware encoder while the window is built
+        probe_encoders_in_background()
 
         # Set window properties
         self.setWindowTitle("Historian Video Editor")
@@ -2968,6 +4113,7 @@ class VideoCompilationEditor(QMainWindow):
 
         # State tracking
         self.preview_file = None
+        self.streaming_preview = None  # Preview playing while ffmpeg still writes it
         self.current_item = None
         self.default_image_duration = 5.0
         self.position_slider_being_dragged = False
@@ -2975,6 +4121,7 @@ class VideoCompilationEditor(QMainWindow):
         self.is_processing = False
         self.thread_active = False  # Track thread status
         self.preview_all_cache = {"signature": None, "path": None, "total_duration": 0}
+        self.pending_preview_signature = None  # Item layout of the preview being built
         self.music_file = None
         self.music_volume = 0.7
         self.music_tracks = []
@@ -2994,6 +4141,11 @@ class VideoCompilationEditor(QMainWindow):
         # Processing thread
         self.processing_thread = None  # Initialized on demand
 
+        # Background preview rendering for items that changed
+        self.prefetch_worker = ProcessingWorker()
+        self.preview_pool = QThreadPool(self)
+        self.prefetching = set()  # Preview filenames queued on the preview pool
+
         # UI setup
         self.setup_ui()
 
@@ -3049,6 +4201,12 @@ class VideoCompilationEditor(QMainWindow):
         add_music_btn.setMinimumSize(120, 40)
         add_music_btn.setToolTip("Add background music tracks")
 
+        self.use_gpu_checkbox = QCheckBox("Use GPU")
+        self.use_gpu_checkbox.setChecked(True)
+        self.use_gpu_checkbox.setToolTip(
+            "Use a hardware video encoder when one is available"
+        )
+
         toolbar.addWidget(add_videos_btn)
         toolbar.addWidget(add_images_btn)
         toolbar.addWidget(edit_btn)
@@ -3056,6 +4214,7 @@ class VideoCompilationEditor(QMainWindow):
         toolbar.addWidget(randomize_btn)
         toolbar.addStretch()
         toolbar.addWidget(add_music_btn)
+        toolbar.addWidget(self.use_gpu_checkbox)
         toolbar.addWidget(self.preview_all_btn)
         toolbar.addWidget(self.export_btn)
         main_layout.addLayout(toolbar)
@@ -3330,11 +4489,30 @@ class VideoCompilationEditor(QMainWindow):
             finally:
                 self.progress_dialog = None
         self.status_label.setText("Historian: Processing canceled")
+        self.reset_processing_buttons()
+
+    def lock_processing_buttons(self, active_button):
+        """Turn the button of the running task into a cancel button and disable the others"""
+        cancel_text = "Cancel Export" if active_button is self.export_btn else "Cancel Preview"
+        try:
+            active_button.setText(cancel_text)
+            active_button.clicked.disconnect()
+            active_button.clicked.connect(self.cancel_processing)
+        except Exception as e:
+            print(f"Error updating {cancel_text.lower()} button: {e}")
+        for button in (self.preview_all_btn, self.export_btn):
+            if button is not active_button:
+                button.setEnabled(False)
+        self.use_gpu_checkbox.setEnabled(False)
+
+    def reset_processing_buttons(self):
+        """Restore the preview and export buttons after processing ends"""
         if self.preview_all_btn:
             try:
                 self.preview_all_btn.setText("Preview All")
                 self.preview_all_btn.clicked.disconnect()
                 self.preview_all_btn.clicked.connect(self.preview_all)
+                self.preview_all_btn.setEnabled(True)
             except Exception as e:
                 print(f"Error resetting preview_all_btn: {e}")
         if self.export_btn:
@@ -3342,8 +4520,10 @@ class VideoCompilationEditor(QMainWindow):
                 self.export_btn.setText("Export")
                 self.export_btn.clicked.disconnect()
                 self.export_btn.clicked.connect(self.export)
+                self.export_btn.setEnabled(True)
             except Exception as e:
                 print(f"Error resetting export_btn: {e}")
+        self.use_gpu_checkbox.setEnabled(True)
 
     def processing_finished(self, task, result):
         """Handle processing thread completion with robust cleanup."""
@@ -3362,20 +4542,8 @@ class VideoCompilationEditor(QMainWindow):
                 print(f"Error closing progress dialog: {e}")
             finally:
                 self.progress_dialog = None
-        if task == "preview_all" and self.preview_all_btn:
-            try:
-                self.preview_all_btn.setText("Preview All")
-                self.preview_all_btn.clicked.disconnect()
-                self.preview_all_btn.clicked.connect(self.preview_all)
-            except Exception as e:
-                print(f"Error resetting preview_all_btn: {e}")
-        elif task == "export" and self.export_btn:
-            try:
-                self.export_btn.setText("Export")
-                self.export_btn.clicked.disconnect()
-                self.export_btn.clicked.connect(self.export)
-            except Exception as e:
-                print(f"Error resetting export_btn: {e}")
+        if task in ("preview_all", "export"):
+            self.reset_processing_buttons()
         if result == "Aborted":
             self.status_label.setText("Historian: Operation canceled")
         elif isinstance(result, str) and result.startswith("Error"):
@@ -3384,9 +4552,27 @@ class VideoCompilationEditor(QMainWindow):
         else:
             self.status_label.setText(f"Historian: {task.capitalize()} completed")
             if task == "preview_all" and isinstance(result, tuple):
+                # Only one full preview is kept on disk
+                old_preview = self.preview_all_cache["path"]
+                if old_preview and old_preview != result[0]:
+                    release_segments([old_preview])
+                self.preview_all_cache["signature"] = self.pending_preview_signature
+                self.preview_all_cache["path"] = result[0]
+                self.preview_all_cache["total_duration"] = result[1]
                 self.preview_file = result[0]
                 self.media_player.setMedia(QMediaContent(QUrl.fromLocalFile(result[0])))
                 self.media_player.play()
+            elif task == "preview_item" and isinstance(result, str) and result == self.streaming_preview:
+                # Some backends read the size once, reopen the finished file where it was
+                position = self.media_player.position()
+                self.media_player.setMedia(QMediaContent(QUrl.fromLocalFile(result)))
+                self.media_player.setPosition(position)
+                self.media_player.play()
+            elif task == "preview_item" and isinstance(result, str) and result != self.preview_file:
+                self.preview_file = result
+                self.media_player.setMedia(QMediaContent(QUrl.fromLocalFile(result)))
+                self.media_player.play()
+        self.streaming_preview = None
 
     def check_pending_changes(self):
         has_pending_changes = False
@@ -3411,6 +4597,7 @@ class VideoCompilationEditor(QMainWindow):
     def processing_error(self, task, error_msg):
         self.is_processing = False
         self.thread_active = False
+        self.streaming_preview = None
         if self.processing_thread:
             try:
                 self.processing_thread.progress.disconnect()
@@ -3423,6 +4610,7 @@ class VideoCompilationEditor(QMainWindow):
                 print(f"Error closing progress dialog: {e}")
             finally:
                 self.progress_dialog = None
+        self.reset_processing_buttons()
         self.status_label.setText(f"Error during {task}: {error_msg}")
         QMessageBox.warning(self, "Error", f"An error occurred: {error_msg}")
         print(f"Full error details: {error_msg}")  # Log full ffmpeg error
@@ -3447,6 +4635,8 @@ class VideoCompilationEditor(QMainWindow):
 
     def closeEvent(self, event):
         self.media_player.stop()
+        # Close the player's handle on the current preview so it can be deleted
+        self.media_player.setMedia(QMediaContent())
         if (
             self.thread_active
             and self.processing_thread
@@ -3454,9 +4644,101 @@ class VideoCompilationEditor(QMainWindow):
         ):
             self.processing_thread.abort()
             self.processing_thread.wait()
+        # Stop background previews and let thumbnail grabs finish before their files go away
+        self.prefetch_worker.abort()
+        self.preview_pool.clear()
+        self.preview_pool.waitForDone(5000)
+        QThreadPool.globalInstance().waitForDone(2000)
+        _segment_cache.clear()
+        with _thumb_strips_lock:
+            _thumb_strips.clear()
         cleanup_temp_dirs()
         event.accept()
 
+    def prefetch_previews(self, media_items):
+        """Render previews for the given items on the preview pool"""
+        # Never wait on the encoder probes here, that would block the UI
+        encoder = select_video_encoder(
+            self.use_gpu_checkbox.isChecked(), allow_vaapi=True, wait=False
+        )
+        if encoder == "libx264":
+            # Each batch already keeps several encoders busy
+            batch_size = 4
+            self.preview_pool.setMaxThreadCount(max(1, min(4, CPU_COUNT // batch_size)))
+        else:
+            # Consumer GPUs only allow a couple of concurrent encode sessions.
+            # Also used while the probes still run, since it is safe either way
+            batch_size = 2
+            self.preview_pool.setMaxThreadCount(1)
+        self.prefetch_worker.use_gpu = self.use_gpu_checkbox.isChecked()
+        self.prefetch_worker.parallel_jobs = self.preview_pool.maxThreadCount()
+        queued = []
+        for media_item in media_items:
+            preview_name = media_item.get_preview_filename()
+            if media_item.preview_status == "ready" or preview_name in self.prefetching:
+                continue
+            self.prefetching.add(preview_name)
+            queued.append(media_item)
+        # One ffmpeg process renders each batch instead of one process per file
+        for start in range(0, len(queued), batch_size):
+            task = PreviewTask(self.prefetch_worker, queued[start:start + batch_size])
+            task.signals.finished.connect(self.preview_prefetched)
+            self.preview_pool.start(task)
+
+    def preview_prefetched(self, preview_name, result):
+        """Forget a finished background preview"""
+        self.prefetching.discard(preview_name)
+
+    def load_media_items(self, files, item_class, progress=None):
+        """Probe media files in parallel, returning (path, item, error) in file order"""
+        probes = {}
+        # Probe each distinct file once, even if it was selected several times
+        unique_files = list(dict.fromkeys(files))
+        if progress:
+            progress.setMaximum(len(unique_files))
+        # Probes mostly wait on ffprobe, so allow a few more workers than cores
+        workers = max(1, min(len(unique_files), CPU_COUNT * 2))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {
+                executor.submit(item_class.probe_file, path): path
+                for path in unique_files
+            }
+            while pending:
+                # Keep the UI responsive while the probes run
+                done, _ = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    try:
+                        probes[path] = (future.result(), None)
+                    except ValueError as e:
+                        probes[path] = (None, str(e))
+                if progress:
+                    progress.setValue(len(probes))
+                    if done:
+                        progress.setLabelText(
+                            f"Imported {os.path.basename(path)}..."
+                        )
+                    if progress.wasCanceled():
+                        for future in pending:
+                            future.cancel()
+                        break
+                QApplication.processEvents()
+
+        # Build the items from the collected metadata without further spawns
+        results = []
+        for path in files:
+            if path not in probes:
+                continue  # Skipped by cancel
+            probe, error = probes[path]
+            item = None
+            if error is None:
+                try:
+                    item = item_class(path, probe=probe)
+                except ValueError as e:
+                    error = str(e)
+            results.append((path, item, error))
+        return results
+
     def add_videos(self):
         files, _ = QFileDialog.getOpenFileNames(
             self,
@@ -3476,20 +4758,15 @@ class VideoCompilationEditor(QMainWindow):
             progress.setWindowModality(Qt.WindowModal)
             progress.show()
         failed_files = []
-        for i, file_path in enumerate(files):
-            if progress:
-                progress.setValue(i)
-                progress.setLabelText(f"Importing {os.path.basename(file_path)}...")
-                if progress.wasCanceled():
-                    break
-            try:
-                clip = VideoClip(file_path)
-                item = QListWidgetItem(os.path.basename(file_path))
-                item.setData(Qt.UserRole, clip)
-                self.clip_list.addItem(item)
-            except ValueError as e:
-                failed_files.append(f"{os.path.basename(file_path)}: {str(e)}")
-            QApplication.processEvents()
+        added = []
+        for file_path, clip, error in self.load_media_items(files, VideoClip, progress):
+            if error:
+                failed_files.append(f"{os.path.basename(file_path)}: {error}")
+                continue
+            item = QListWidgetItem(os.path.basename(file_path))
+            item.setData(Qt.UserRole, clip)
+            self.clip_list.addItem(item)
+            added.append(clip)
         if progress:
             progress.setValue(len(files))
         if failed_files:
@@ -3510,6 +4787,7 @@ class VideoCompilationEditor(QMainWindow):
             self.clip_list.setCurrentRow(0)
         self.update_timeline()
         self.preview_all_cache["signature"] = None
+        self.prefetch_previews(added)
 
     def add_images(self):
         files, _ = QFileDialog.getOpenFileNames(
@@ -3536,24 +4814,19 @@ class VideoCompilationEditor(QMainWindow):
             progress.setWindowModality(Qt.WindowModal)
             progress.show()
         failed_files = []
-        for i, file_path in enumerate(files):
-            if progress:
-                progress.setValue(i)
-                progress.setLabelText(f"Importing {os.path.basename(file_path)}...")
-                if progress.wasCanceled():
-                    break
-            try:
-                image = ImageItem(file_path)
-                if apply_to_all:
-                    image.display_duration = duration
-                    image.duration = duration
-                    image.end_time = duration
-                item = QListWidgetItem(os.path.basename(file_path))
-                item.setData(Qt.UserRole, image)
-                self.clip_list.addItem(item)
-            except ValueError as e:
-                failed_files.append(f"{os.path.basename(file_path)}: {str(e)}")
-            QApplication.processEvents()
+        added = []
+        for file_path, image, error in self.load_media_items(files, ImageItem, progress):
+            if error:
+                failed_files.append(f"{os.path.basename(file_path)}: {error}")
+                continue
+            if apply_to_all:
+                image.display_duration = duration
+                image.duration = duration
+                image.end_time = duration
+            item = QListWidgetItem(os.path.basename(file_path))
+            item.setData(Qt.UserRole, image)
+            self.clip_list.addItem(item)
+            added.append(image)
         if progress:
             progress.setValue(len(files))
         if failed_files:
@@ -3572,6 +4845,7 @@ class VideoCompilationEditor(QMainWindow):
             self.clip_list.setCurrentRow(0)
         self.update_timeline()
         self.preview_all_cache["signature"] = None
+        self.prefetch_previews(added)
 
     def edit_selected(self):
         if not self.current_item:
@@ -3588,6 +4862,7 @@ class VideoCompilationEditor(QMainWindow):
             self.update_timeline()
             self.check_pending_changes()
             self.preview_all_cache["signature"] = None
+            self.prefetch_previews([self.current_item])
 
     def randomize_order(self):
         if self.clip_list.count() <= 1:
@@ -3595,11 +4870,18 @@ class VideoCompilationEditor(QMainWindow):
         items = [(self.clip_list.item(i).text(), self.clip_list.item(i).data(Qt.UserRole)) 
                  for i in range(self.clip_list.count())]
         random.shuffle(items)
-        self.clip_list.clear()
-        for text, data in items:
-            item = QListWidgetItem(text)
-            item.setData(Qt.UserRole, data)
-            self.clip_list.addItem(item)
+        # Rebuild in one pass without per-item signals and repaints
+        self.clip_list.blockSignals(True)
+        self.clip_list.setUpdatesEnabled(False)
+        try:
+            self.clip_list.clear()
+            for text, data in items:
+                item = QListWidgetItem(text)
+                item.setData(Qt.UserRole, data)
+                self.clip_list.addItem(item)
+        finally:
+            self.clip_list.setUpdatesEnabled(True)
+            self.clip_list.blockSignals(False)
         # Update current_item to match new selection
         if self.clip_list.count() > 0:
             self.clip_list.setCurrentRow(0)  # Ensure selection updates
@@ -3621,22 +4903,32 @@ class VideoCompilationEditor(QMainWindow):
                 self, "No Selection", "Please select a media item to remove."
             )
             return
-        for i in range(self.clip_list.count()):
-            item = self.clip_list.item(i)
-            if item.data(Qt.UserRole) == self.current_item:
-                if self.current_item.preview_file and os.path.exists(
-                    self.current_item.preview_file
-                ):
-                    try:
-                        os.unlink(self.current_item.preview_file)
-                    except Exception as e:
-                        print(f"Error deleting preview file: {e}")
-                self.clip_list.takeItem(i)
-                self.current_item = None
-                self.status_label.setText("Item removed")
-                self.update_timeline()
-                self.preview_all_cache["signature"] = None
-                break
+        # The selected row normally holds the current item, so avoid a scan
+        row = self.clip_list.currentRow()
+        current = self.clip_list.item(row) if row >= 0 else None
+        if current is None or current.data(Qt.UserRole) is not self.current_item:
+            row = next(
+                (
+                    i
+                    for i in range(self.clip_list.count())
+                    if self.clip_list.item(i).data(Qt.UserRole) is self.current_item
+                ),
+                -1,
+            )
+        if row < 0:
+            return
+        if self.current_item.preview_file and os.path.exists(
+            self.current_item.preview_file
+        ):
+            try:
+                os.unlink(self.current_item.preview_file)
+            except Exception as e:
+                print(f"Error deleting preview file: {e}")
+        self.clip_list.takeItem(row)
+        self.current_item = None
+        self.status_label.setText("Item removed")
+        self.update_timeline()
+        self.preview_all_cache["signature"] = None
 
     def selection_changed(self):
         selected_items = self.clip_list.selectedItems()
@@ -3693,9 +4985,21 @@ class VideoCompilationEditor(QMainWindow):
         self.processing_thread.progress.connect(self.update_progress)
         self.processing_thread.finished.connect(self.processing_finished)
         self.processing_thread.error.connect(self.processing_error)
+        self.processing_thread.preview_started.connect(self.preview_item_started)
+        self.processing_thread.worker.use_gpu = self.use_gpu_checkbox.isChecked()
         self.processing_thread.setup_task("preview_item", [self.current_item])
         self.processing_thread.start()
 
+    def preview_item_started(self, preview_file):
+        """Start playback of a preview that is still being written"""
+        if self.progress_dialog:
+            self.progress_dialog.close()
+            self.progress_dialog = None
+        self.preview_file = self.streaming_preview = preview_file
+        self.media_player.setMedia(QMediaContent(QUrl.fromLocalFile(preview_file)))
+        self.media_player.play()
+        self.status_label.setText(f"Historian: Playing: {os.path.basename(self.current_item.file_path)}")
+
     def preview_all(self):
         """Preview all items with robust thread initialization."""
         if self.clip_list.count() == 0:
@@ -3705,24 +5009,24 @@ class VideoCompilationEditor(QMainWindow):
             QMessageBox.information(self, "Processing", "Please wait for the current operation to complete.")
             return
         items = [self.clip_list.item(i).data(Qt.UserRole) for i in range(self.clip_list.count())]
+        signature = tuple(item.get_preview_filename() for item in items)
         need_new_preview = self.check_pending_changes()
-        if not need_new_preview and self.preview_all_cache["path"] and os.path.exists(self.preview_all_cache["path"]):
+        if (not need_new_preview and self.preview_all_cache["signature"] == signature
+                and self.preview_all_cache["path"] and os.path.exists(self.preview_all_cache["path"])):
             self.preview_file = self.preview_all_cache["path"]
             self.status_label.setText("Historian: Playing: All items (cached)")
             self.media_player.setMedia(QMediaContent(QUrl.fromLocalFile(self.preview_file)))
             self.media_player.play()
             return
+        # Release the player's handle so the previous preview can be removed
+        self.media_player.stop()
+        self.media_player.setMedia(QMediaContent())
+        self.pending_preview_signature = signature
         self.update_timeline()
         self.is_processing = True
         self.thread_active = True
         self.status_label.setText("Historian: Creating full preview...")
-        if self.preview_all_btn:
-            try:
-                self.preview_all_btn.setText("Cancel Preview")
-                self.preview_all_btn.clicked.disconnect()
-                self.preview_all_btn.clicked.connect(self.cancel_processing)
-            except Exception as e:
-                print(f"Error updating preview_all_btn: {e}")
+        self.lock_processing_buttons(self.preview_all_btn)
         self.progress_dialog = QProgressDialog("Creating preview...", "Cancel", 0, 100, self)
         self.progress_dialog.setWindowTitle("Preview")
         self.progress_dialog.setWindowModality(Qt.WindowModal)
@@ -3734,6 +5038,7 @@ class VideoCompilationEditor(QMainWindow):
         self.processing_thread.finished.connect(self.processing_finished)
         self.processing_thread.error.connect(self.processing_error)
         self.processing_thread.worker.music_tracks = self.music_tracks
+        self.processing_thread.worker.use_gpu = self.use_gpu_checkbox.isChecked()
         if self.music_tracks and len(self.music_tracks) > 0:
             self.processing_thread.worker.music_file = self.music_tracks[0].file_path
             self.processing_thread.worker.music_volume = self.music_tracks[0].volume
@@ -3759,6 +5064,7 @@ class VideoCompilationEditor(QMainWindow):
         self.is_processing = True
         self.thread_active = True
         self.status_label.setText("Exporting...")
+        self.lock_processing_buttons(self.export_btn)
         self.progress_dialog = QProgressDialog("Exporting video...", "Cancel", 0, 100, self)
         self.progress_dialog.setWindowTitle("Export")
         self.progress_dialog.setWindowModality(Qt.WindowModal)
@@ -3770,6 +5076,7 @@ class VideoCompilationEditor(QMainWindow):
         self.processing_thread.finished.connect(self.processing_finished)
         self.processing_thread.error.connect(self.processing_error)
         self.processing_thread.worker.music_tracks = self.music_tracks
+        self.processing_thread.worker.use_gpu = self.use_gpu_checkbox.isChecked()
         if self.music_tracks and len(self.music_tracks) > 0:
             self.processing_thread.worker.music_file = self.music_tracks[0].file_path
             self.processing_thread.worker.music_volume = self.music_tracks[0].volume